@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+잔액 엔진 - 장부별 누적 잔액, 월말 체크포인트, 은행 보고 잔액과의 대사(reconciliation)
+"""
+
+import bisect
+import json
+from itertools import accumulate
+
+import pandas as pd
+
+from dedup_engine import transaction_id, transaction_key
+
+# 장부 구분: 일반 계좌(카카오+신한 통합)와 세이프박스
+MAIN_LEDGER = 'main'
+SAFEBOX_LEDGER = 'safe_box'
+
+def ledger_of(transaction):
+    """거래가 속한 장부 이름"""
+    return SAFEBOX_LEDGER if transaction['is_safe_box'] else MAIN_LEDGER
+
+def signed_amount(transaction):
+    """잔액 증감액 (세이프박스는 입금 외 모든 거래를 차감, 일반 계좌는 출금만 차감)"""
+    if transaction['type'] == 'income':
+        return transaction['amount']
+    if transaction['is_safe_box'] or transaction['type'] == 'expense':
+        return -transaction['amount']
+    return 0
+
+def _ledger_frame(transactions):
+    """잔액 계산용 DataFrame (거래 순서 유지)"""
+    return pd.DataFrame({
+        'ledger': [ledger_of(t) for t in transactions],
+        'bank': [t['bank'] for t in transactions],
+        'date': [t['date'] for t in transactions],
+        'signed': [signed_amount(t) for t in transactions],
+    })
+
+def compute_running_balances(transactions):
+    """장부별 누적 잔액을 한 번에 계산하여 balance_after에 기록 (거래는 날짜순 정렬 상태여야 함)"""
+    if not transactions:
+        return {}
+
+    df = _ledger_frame(transactions)
+    df['balance'] = df.groupby('ledger')['signed'].cumsum()
+
+    for trans, balance in zip(transactions, df['balance'].tolist()):
+        trans['balance_after'] = int(balance)
+
+    return build_checkpoints(transactions)
+
+def build_checkpoints(transactions):
+    """장부별 월말 잔액 스냅샷 생성: {장부: {'YYYY-MM': 잔액}}"""
+    checkpoints = {}
+    if not transactions:
+        return checkpoints
+
+    df = pd.DataFrame({
+        'ledger': [ledger_of(t) for t in transactions],
+        'month': [t['date'][:7] for t in transactions],
+        'balance': [t['balance_after'] for t in transactions],
+    })
+    month_end = df.groupby(['ledger', 'month'], sort=True)['balance'].last()
+
+    for (ledger, month), balance in month_end.items():
+        checkpoints.setdefault(ledger, {})[month] = int(balance)
+
+    return checkpoints
+
+def recompute_from_checkpoint(transactions, checkpoints, since_date):
+    """since_date가 속한 달부터만 잔액 재계산 (직전 월말 체크포인트에서 시작)"""
+    month = since_date[:7]
+    start = bisect.bisect_left([t['date'] for t in transactions], f'{month}-01')
+    tail = transactions[start:]
+
+    recomputed = 0
+    for ledger in {ledger_of(t) for t in tail}:
+        ledger_checkpoints = checkpoints.setdefault(ledger, {})
+        prior_months = [m for m in ledger_checkpoints if m < month]
+        opening = ledger_checkpoints[max(prior_months)] if prior_months else 0
+
+        rows = [t for t in tail if ledger_of(t) == ledger]
+        balances = accumulate((signed_amount(t) for t in rows), initial=opening)
+        next(balances)  # 시작 잔액 건너뛰기
+        for trans, balance in zip(rows, balances):
+            trans['balance_after'] = balance
+            ledger_checkpoints[trans['date'][:7]] = balance
+        recomputed += len(rows)
+
+    return recomputed
+
+def insert_transaction(transactions, checkpoints, transaction):
+    """뒤늦게 도착한 거래를 날짜순 위치에 삽입하고 해당 월부터 잔액 재계산
+
+    ID가 없으면 assign_transaction_ids와 같은 규칙으로 부여 (같은 날짜의 동일 내용 거래 뒤에 삽입되므로
+    기존 거래의 ID는 바뀌지 않음)
+    """
+    dates = [t['date'] for t in transactions]
+    position = bisect.bisect_right(dates, transaction['date'])
+    if 'id' not in transaction:
+        key = transaction_key(transaction)
+        same_day = transactions[bisect.bisect_left(dates, transaction['date']):position]
+        transaction['id'] = transaction_id(key, sum(1 for t in same_day if transaction_key(t) == key))
+    transactions.insert(position, transaction)
+    return recompute_from_checkpoint(transactions, checkpoints, transaction['date'])
+
+def update_balances(transactions, previous_transactions=None, previous_checkpoints=None):
+    """이전 스냅샷의 잔액과 체크포인트를 재사용하여 새로 추가된 거래가 속한 달부터만 재계산
+
+    이전 거래가 모두 같은 순서로 남아 있고 추가만 된 경우에만 재사용하며, 그렇지 않으면 전체 재계산
+    반환: (체크포인트, 재계산한 거래 수)
+    """
+    previous_transactions = previous_transactions or []
+    reusable = bool(previous_transactions and previous_checkpoints) and all(
+        'id' in t for t in previous_transactions
+    )
+    if reusable:
+        previous_by_id = {t['id']: t for t in previous_transactions}
+        kept_ids = [t['id'] for t in transactions if t['id'] in previous_by_id]
+        reusable = kept_ids == [t['id'] for t in previous_transactions]
+
+    if not reusable:
+        return compute_running_balances(transactions), len(transactions)
+
+    added = [t for t in transactions if t['id'] not in previous_by_id]
+    for trans in transactions:
+        if trans['id'] in previous_by_id:
+            trans['balance_after'] = previous_by_id[trans['id']]['balance_after']
+
+    checkpoints = {ledger: dict(months) for ledger, months in previous_checkpoints.items()}
+    if not added:
+        return checkpoints, 0
+    return checkpoints, recompute_from_checkpoint(transactions, checkpoints, min(t['date'] for t in added))
+
+def latest_balances(transactions):
+    """장부별 최종 잔액"""
+    balances = {MAIN_LEDGER: 0, SAFEBOX_LEDGER: 0}
+    for trans in transactions:
+        balances[ledger_of(trans)] = trans['balance_after']
+    return balances
+
+def _currency_column(series):
+    """'1,234원' 형식의 통화 컬럼을 정수 컬럼으로 일괄 변환"""
+    cleaned = series.astype(str).str.replace(r'[,원\s]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0).astype(int)
+
+def load_bank_balances(df_kakao=None, df_shinhan=None):
+    """은행 원본 내역(이미 읽은 DataFrame)에서 거래 후 잔액 로드: bank, timestamp, date, reported_balance"""
+    print("\n은행 보고 잔액 로딩 중...")
+    frames = []
+
+    if df_kakao is not None:
+        try:
+            df = df_kakao[df_kakao['거래일시'].notna()]
+            frames.append(pd.DataFrame({
+                'bank': 'kakao_bank',
+                'timestamp': pd.to_datetime(df['거래일시'].astype(str), format='%Y.%m.%d %H:%M:%S'),
+                'reported_balance': _currency_column(df['거래 후 잔액']),
+            }))
+            print(f"  - 카카오뱅크 잔액 {len(df)}건 로드 완료")
+        except Exception as e:
+            print(f"  - 카카오뱅크 파일 로드 실패: {e}")
+
+    if df_shinhan is not None:
+        try:
+            # 최신 거래가 위쪽
+            df = df_shinhan[df_shinhan['거래일자'].notna()].iloc[::-1]
+            frames.append(pd.DataFrame({
+                'bank': 'shinhan_bank',
+                'timestamp': pd.to_datetime(df['거래일자'].astype(str) + ' ' + df['거래시간'].astype(str)),
+                'reported_balance': _currency_column(df['잔액(원)']),
+            }))
+            print(f"  - 신한은행 잔액 {len(df)}건 로드 완료")
+        except Exception as e:
+            print(f"  - 신한은행 파일 로드 실패: {e}")
+
+    if not frames:
+        return pd.DataFrame(columns=['bank', 'timestamp', 'date', 'reported_balance'])
+
+    bank_balances = pd.concat(frames, ignore_index=True)
+    bank_balances = bank_balances.sort_values(['bank', 'timestamp'], kind='stable')
+    bank_balances['date'] = bank_balances['timestamp'].dt.strftime('%Y-%m-%d')
+    return bank_balances.reset_index(drop=True)
+
+def reconcile_balances(transactions, bank_balances, tolerance=0):
+    """은행별 일말 잔액을 은행 보고 잔액과 한 번에 비교하여 차이(drift) 표시"""
+    if not transactions or bank_balances.empty:
+        return {'checked_days': 0, 'drift_days': 0, 'by_bank': {}, 'drift_events': []}
+
+    # 은행 관점 잔액: 세이프박스 이동도 카카오뱅크 잔액에 반영됨
+    ledger = _ledger_frame(transactions)
+    ledger['computed_balance'] = ledger.groupby('bank')['signed'].cumsum()
+    computed = ledger.groupby(['bank', 'date'])['computed_balance'].last()
+    reported = bank_balances.groupby(['bank', 'date'])['reported_balance'].last()
+
+    daily = pd.concat([computed, reported], axis=1).sort_index().reset_index()
+    daily = daily[daily['bank'].isin(reported.index.get_level_values('bank'))]
+    # 한쪽에만 거래가 있는 날은 직전 잔액을 유지, 첫 거래 이전은 0
+    filled = daily.groupby('bank')[['computed_balance', 'reported_balance']].ffill().fillna(0)
+    daily[['computed_balance', 'reported_balance']] = filled.astype(int)
+    daily['drift'] = daily['computed_balance'] - daily['reported_balance']
+    daily['flagged'] = daily['drift'].abs() > tolerance
+
+    # 차이 금액이 바뀌는 날만 이벤트로 기록
+    previous_drift = daily.groupby('bank')['drift'].shift(fill_value=0)
+    events = daily[daily['drift'] != previous_drift]
+
+    by_bank = {}
+    for bank, group in daily.groupby('bank'):
+        last = group.iloc[-1]
+        flagged = group[group['flagged']]
+        by_bank[bank] = {
+            'computed_balance': int(last['computed_balance']),
+            'reported_balance': int(last['reported_balance']),
+            'drift': int(last['drift']),
+            'drift_days': int(len(flagged)),
+            'first_drift_date': flagged['date'].iloc[0] if len(flagged) else None,
+        }
+
+    return {
+        'checked_days': int(len(daily)),
+        'drift_days': int(daily['flagged'].sum()),
+        'by_bank': by_bank,
+        'drift_events': [
+            {
+                'bank': row.bank,
+                'date': row.date,
+                'computed_balance': int(row.computed_balance),
+                'reported_balance': int(row.reported_balance),
+                'drift': int(row.drift),
+            }
+            for row in events.itertuples(index=False)
+        ],
+    }
+
+if __name__ == "__main__":
+    with open('dashboard_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    from convert_excel_to_json import read_kakao_export, read_shinhan_export
+
+    bank_balances = load_bank_balances(
+        read_kakao_export("251111_사우회회비 통장 거래 내역(카카오뱅크계좌).xlsx"),
+        read_shinhan_export("신한은행_거래내역조회_20251111111910.xls")
+    )
+    result = reconcile_balances(data['transactions'], bank_balances)
+
+    print(f"\n대사 결과: {result['checked_days']}일 검사, 차이 발생 {result['drift_days']}일")
+    for bank, info in result['by_bank'].items():
+        print(f"  - {bank}: 계산 ₩{info['computed_balance']:,} / 보고 ₩{info['reported_balance']:,} "
+              f"(차이 ₩{info['drift']:,}, 최초 차이: {info['first_drift_date']})")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 단체(사우회/동호회)의 엑셀 파일을 한 번에 처리하는 일괄 실행 스크립트
+"""
+
+import argparse
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from convert_excel_to_json import convert_workbooks
+from enhanced_data_processor import process_enhanced_data
+
+def load_batch_config(config_file):
+    """일괄 처리 설정 로드 및 검증 (파일 경로는 설정 파일 위치 기준)"""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(config_file))
+    organizations = config.get('organizations') or []
+    if not organizations:
+        raise ValueError("처리할 단체(organizations)가 없습니다")
+
+    names = [org['name'] for org in organizations]
+    if len(names) != len(set(names)):
+        raise ValueError("단체 이름(name)이 중복되었습니다")
+
+    # 같은 출력 폴더를 쓰면 동시 실행 중 서로의 JSON/차분 파일을 덮어씀
+    output_dirs = [os.path.normcase(os.path.abspath(_output_dir(org, base_dir))) for org in organizations]
+    if len(output_dirs) != len(set(output_dirs)):
+        raise ValueError("단체별 출력 폴더(output_dir)가 중복되었습니다")
+
+    # 계좌 정보는 단체마다 직접 지정 (기본값은 사우회 계좌)
+    missing = [org['name'] for org in organizations if not org.get('accounts')]
+    if missing:
+        raise ValueError(f"계좌 정보(accounts)가 지정되지 않은 단체: {', '.join(missing)}")
+
+    # 회원 명단도 단체마다 직접 지정 (기본값은 사우회 회원)
+    missing = [org['name'] for org in organizations if not org.get('members')]
+    if missing:
+        raise ValueError(f"회원 명단(members)이 지정되지 않은 단체: {', '.join(missing)}")
+
+    return config, base_dir
+
+def _resolve(base_dir, path):
+    """설정 파일 기준 상대 경로를 절대 경로로 변환"""
+    if not path:
+        return None
+    return path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+def _output_dir(org, base_dir):
+    """단체별 출력 폴더 (기본값: output/<단체 이름>)"""
+    return _resolve(base_dir, org.get('output_dir') or os.path.join('output', org['name']))
+
+def run_organization(org, base_dir):
+    """단체 하나 처리 (작업 프로세스에서 실행, 실패는 결과로 반환)"""
+    name = org['name']
+    output_dir = _output_dir(org, base_dir)
+    dashboard_file = os.path.join(output_dir, 'dashboard_data.json')
+    enhanced_file = os.path.join(output_dir, 'enhanced_dashboard_data.json')
+    log_file = os.path.join(output_dir, 'batch.log')
+
+    result = {
+        'name': name,
+        'status': 'ok',
+        'error': None,
+        'timings': {},
+        'output_dir': output_dir,
+        'log_file': log_file
+    }
+
+    started = time.perf_counter()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        # 단체별 로그 파일로 출력 분리 (동시 실행 시 출력이 섞이지 않도록)
+        with open(log_file, 'w', encoding='utf-8') as log, redirect_stdout(log):
+            stage_started = time.perf_counter()
+            convert_workbooks(
+                report_file=_resolve(base_dir, org['report_file']),
+                kakao_file=_resolve(base_dir, org.get('kakao_file')),
+                shinhan_file=_resolve(base_dir, org.get('shinhan_file')),
+                output_file=dashboard_file,
+                accounts=org.get('accounts'),
+                pretty=org.get('pretty', True)
+            )
+            result['timings']['convert'] = time.perf_counter() - stage_started
+
+            stage_started = time.perf_counter()
+            process_enhanced_data(
+                input_file=dashboard_file,
+                output_file=enhanced_file,
+                members=org.get('members'),
+                dues_config_file=_resolve(base_dir, org.get('dues_config')) or '',
+                pretty=org.get('pretty', True)
+            )
+            result['timings']['enhanced'] = time.perf_counter() - stage_started
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f'{type(e).__name__}: {e}'
+        result['traceback'] = traceback.format_exc()
+
+    result['timings']['total'] = time.perf_counter() - started
+    return result
+
+def run_batch(config_file, workers=None):
+    """설정에 나열된 모든 단체를 작업 프로세스 풀에서 동시에 처리"""
+    config, base_dir = load_batch_config(config_file)
+    organizations = config['organizations']
+    workers = workers or config.get('workers') or min(len(organizations), os.cpu_count() or 1)
+
+    print(f"단체 {len(organizations)}곳 처리 시작 (작업 프로세스 {workers}개)")
+    started = time.perf_counter()
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_organization, org, base_dir): org['name'] for org in organizations}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 작업 프로세스 자체가 비정상 종료된 경우
+                result = {'name': name, 'status': 'failed', 'error': f'{type(e).__name__}: {e}', 'timings': {}}
+            results.append(result)
+
+            status = '✓' if result['status'] == 'ok' else '✗'
+            elapsed = result['timings'].get('total', 0)
+            print(f"  {status} {name} ({elapsed:.2f}s){' - ' + result['error'] if result['error'] else ''}")
+
+    wall_time = time.perf_counter() - started
+    results.sort(key=lambda r: [org['name'] for org in organizations].index(r['name']))
+
+    return {
+        'config_file': os.path.abspath(config_file),
+        'run_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'workers': workers,
+        'wall_time': wall_time,
+        'total_org_time': sum(r['timings'].get('total', 0) for r in results),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] != 'ok'),
+        'organizations': results
+    }
+
+def print_timing_report(report):
+    """단체별 단계 시간 보고서 출력"""
+    print("\n" + "="*70)
+    print("일괄 처리 시간 보고서")
+    print("="*70)
+    print(f"{'단체':20s} {'상태':6s} {'변환':>8s} {'분석':>8s} {'합계':>8s}")
+    for r in report['organizations']:
+        t = r['timings']
+        print(f"{r['name']:20s} {r['status']:6s} "
+              f"{t.get('convert', 0):8.2f} {t.get('enhanced', 0):8.2f} {t.get('total', 0):8.2f}")
+    print(f"\n성공 {report['succeeded']}곳 / 실패 {report['failed']}곳")
+    print(f"전체 소요 시간: {report['wall_time']:.2f}s (단체별 합계 {report['total_org_time']:.2f}s)")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='여러 단체의 회비 데이터를 일괄 처리')
+    parser.add_argument('config', nargs='?', default='organizations.json', help='일괄 처리 설정 파일')
+    parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수')
+    parser.add_argument('--report', default='batch_report.json', help='시간 보고서 저장 경로')
+    args = parser.parse_args()
+
+    report = run_batch(args.config, args.workers)
+    print_timing_report(report)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ {args.report} 파일이 성공적으로 생성되었습니다!")
+
+    return 0 if report['failed'] == 0 else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,10 +5,37 @@
 """
 
 import pandas as pd
-import json
 from datetime import datetime
+import os
 import re
 
+from balance_engine import (
+    latest_balances, load_bank_balances, reconcile_balances, update_balances,
+    MAIN_LEDGER, SAFEBOX_LEDGER
+)
+from dedup_engine import assign_transaction_ids, build_merge_report, merge_sources
+from json_writer import dump_json
+from snapshot_delta import load_snapshot, write_snapshot
+
+# 병합된 중복 거래 전체 목록 파일 (대시보드 JSON과 같은 폴더)
+DEDUP_REPORT_FILE = 'dedup_report.json'
+
+# 사우회 계좌 정보 (accounts를 지정하지 않은 단독 실행에서만 사용, 잔액은 계산 결과로 채움)
+DEFAULT_ACCOUNTS = {
+    'kakao_bank': {
+        'account_number': '3333-28-1790885',
+        'description': '카카오뱅크 저축예금'
+    },
+    'safe_box': {
+        'description': '안전 자산 운용'
+    },
+    'shinhan_bank': {
+        'account_number': '110-502-876387',
+        'description': '신한은행 (폐쇄)',
+        'is_closed': True
+    }
+}
+
 def clean_currency(value):
     """통화 문자열을 숫자로 변환"""
     if pd.isna(value):
@@ -108,13 +135,30 @@ def determine_category(row):
 
     return '기타'
 
-def load_shinhan_depositor_names(shinhan_file):
-    """신한은행 파일에서 실제 입금자명 읽기"""
-    print("\n신한은행 입금자명 로딩 중...")
+def read_kakao_export(kakao_file):
+    """카카오뱅크 원본 거래내역 파일 읽기 (실패 시 None)"""
+    print("\n카카오뱅크 원본 파일 읽는 중...")
+    try:
+        # 첫 행은 빈 행, 두 번째 행이 헤더
+        return pd.read_excel(kakao_file, skiprows=1)
+    except Exception as e:
+        print(f"  - 카카오뱅크 파일 로드 실패: {e}")
+        return None
+
+def read_shinhan_export(shinhan_file):
+    """신한은행 원본 거래내역 파일 읽기 (실패 시 None)"""
+    print("\n신한은행 원본 파일 읽는 중...")
     try:
         # skiprows=6: 헤더는 row 6에 있고 데이터는 row 7부터 시작
-        df_shinhan = pd.read_excel(shinhan_file, skiprows=6)
+        return pd.read_excel(shinhan_file, skiprows=6)
+    except Exception as e:
+        print(f"  - 신한은행 파일 로드 실패: {e}")
+        return None
 
+def load_shinhan_depositor_names(df_shinhan):
+    """신한은행 원본 내역(read_shinhan_export 결과)에서 실제 입금자명 읽기"""
+    print("신한은행 입금자명 로딩 중...")
+    try:
         # 입금자명 매핑 딕셔너리 생성: (날짜, 금액) -> 입금자명
         depositor_map = {}
 
@@ -154,14 +198,89 @@ def load_shinhan_depositor_names(shinhan_file):
         print(f"  - 신한은행 파일 로드 실패: {e}")
         return {}
 
-def process_all_transactions(report_file, kakao_file, shinhan_file=None):
-    """모든 거래 내역 처리"""
+def load_kakao_transactions(df_kakao):
+    """카카오뱅크 원본 내역(read_kakao_export 결과)을 거래 목록으로 변환 (세이프박스 이동/이자는 세이프박스 계좌로 구분)"""
+    print("카카오뱅크 원본 거래 내역 처리 중...")
     transactions = []
+    try:
+        for idx, row in df_kakao.iterrows():
+            if pd.isna(row['거래일시']):
+                continue
+
+            amount = clean_currency(row['거래금액'])
+            if amount == 0:
+                continue
+
+            description = str(row['내용']).strip() if not pd.isna(row['내용']) else ''
+            is_safe_box = description.startswith('세이프박스')
+            trans = {
+                'date': parse_date(row['거래일시']),
+                'amount': abs(amount),
+                'description': description,
+                'bank': 'kakao_bank',
+                'is_safe_box': is_safe_box,
+                'depositor_name': ''
+            }
+            trans['type'] = determine_transaction_type({'구분': row['구분'], 'amount': amount, '내용': description})
+            trans['category'] = '세이프박스' if is_safe_box else determine_category(trans)
+            trans['balance_after'] = 0
+
+            transactions.append(trans)
+
+        print(f"  - 카카오뱅크 원본 {len(transactions)}건 로드 완료")
+    except Exception as e:
+        print(f"  - 카카오뱅크 파일 로드 실패: {e}")
+
+    return transactions
+
+def load_shinhan_transactions(df_shinhan):
+    """신한은행 원본 내역(read_shinhan_export 결과)을 거래 목록으로 변환 (적요는 설명, 내용은 입금자명)"""
+    print("신한은행 원본 거래 내역 처리 중...")
+    transactions = []
+    try:
+        for idx, row in df_shinhan.iterrows():
+            if pd.isna(row['거래일자']):
+                continue
+
+            deposit = clean_currency(row['입금(원)'])
+            withdrawal = clean_currency(row['출금(원)'])
+            # 계좌 신규 개설 등 금액 없는 행 제외
+            if deposit == 0 and withdrawal == 0:
+                continue
+
+            trans = {
+                'date': parse_date(row['거래일자']),
+                'amount': deposit or withdrawal,
+                'description': str(row['적요']).strip() if not pd.isna(row['적요']) else '',
+                'bank': 'shinhan_bank',
+                'is_safe_box': False,
+                'depositor_name': str(row['내용']).strip() if not pd.isna(row['내용']) else '',
+                'type': 'income' if deposit > 0 else 'expense'
+            }
+            trans['category'] = determine_category(trans)
+            trans['balance_after'] = 0
+
+            transactions.append(trans)
+
+        print(f"  - 신한은행 원본 {len(transactions)}건 로드 완료")
+    except Exception as e:
+        print(f"  - 신한은행 파일 로드 실패: {e}")
+
+    return transactions
+
+def process_all_transactions(report_file, df_kakao=None, df_shinhan=None, previous=None):
+    """모든 거래 내역 처리 (거래 목록, 장부별 월말 잔액 체크포인트, 중복 병합 보고서 반환)
+
+    df_kakao, df_shinhan: 은행 원본 내역 (read_kakao_export / read_shinhan_export 결과, 없으면 None)
+    previous: 이전 실행의 대시보드 데이터 (잔액 체크포인트 재사용)
+    """
+    report_transactions = []
+    safebox_transactions = []
 
     # 신한은행 입금자명 로드
     depositor_map = {}
-    if shinhan_file:
-        depositor_map = load_shinhan_depositor_names(shinhan_file)
+    if df_shinhan is not None:
+        depositor_map = load_shinhan_depositor_names(df_shinhan)
 
     # 1. 결산 보고서에서 전체 거래 내역 읽기
     print("\n전체 거래 내역 처리 중...")
@@ -200,7 +319,7 @@ def process_all_transactions(report_file, kakao_file, shinhan_file=None):
         trans['category'] = determine_category(trans)
         trans['balance_after'] = 0  # 나중에 계산
 
-        transactions.append(trans)
+        report_transactions.append(trans)
 
     # 2. 세이프박스 거래 내역 읽기
     print("세이프박스 거래 내역 처리 중...")
@@ -227,32 +346,41 @@ def process_all_transactions(report_file, kakao_file, shinhan_file=None):
         trans['category'] = '세이프박스'
         trans['balance_after'] = 0
 
-        transactions.append(trans)
+        safebox_transactions.append(trans)
+
+    # 3. 은행 원본 거래 내역 (보고서보다 우선순위가 낮음 - 보고서에 없는 거래만 추가)
+    sources = {
+        '전체 거래 내역': report_transactions,
+        '세이프박스 거래내역': safebox_transactions
+    }
+    if df_kakao is not None:
+        sources['카카오뱅크 원본'] = load_kakao_transactions(df_kakao)
+    if df_shinhan is not None:
+        sources['신한은행 원본'] = load_shinhan_transactions(df_shinhan)
+
+    # 출처 간 중복 거래 제거 (보고서와 원본이 겹치는 기간 등)
+    source_count = sum(len(rows) for rows in sources.values())
+    transactions, merges = merge_sources(sources)
+    print(f"중복 거래 {len(merges)}건 병합, 원본에만 있는 거래 "
+          f"{len(transactions) - len(report_transactions) - len(safebox_transactions)}건 추가 "
+          f"(전체 {source_count}건)")
 
     # 날짜순 정렬
     transactions.sort(key=lambda x: x['date'])
 
-    # 잔액 계산
-    balance = 0
-    safebox_balance = 0
+    # 거래 ID 부여 (병합 보고서는 ID가 부여된 뒤 작성)
+    assign_transaction_ids(transactions)
+    merge_report = build_merge_report(merges)
 
-    for trans in transactions:
-        if trans['is_safe_box']:
-            if trans['type'] == 'income':
-                safebox_balance += trans['amount']
-            else:
-                safebox_balance -= trans['amount']
-            trans['balance_after'] = safebox_balance
-        else:
-            if trans['type'] == 'income':
-                balance += trans['amount']
-            elif trans['type'] == 'expense':
-                balance -= trans['amount']
-            trans['balance_after'] = balance
+    # 잔액 계산 (이전 스냅샷의 월말 체크포인트가 있으면 새 거래가 속한 달부터만 재계산)
+    previous = previous or {}
+    checkpoints, recomputed = update_balances(
+        transactions, previous.get('transactions'), previous.get('balance_checkpoints')
+    )
 
-    print(f"총 {len(transactions)}개의 거래 처리 완료")
+    print(f"총 {len(transactions)}개의 거래 처리 완료 (잔액 재계산 {recomputed}건)")
 
-    return transactions
+    return transactions, checkpoints, merge_report
 
 def is_internal_transfer(description):
     """내부 이체 여부 확인 (계좌 간 이동)"""
@@ -264,8 +392,6 @@ def calculate_summary(transactions):
     total_income = 0
     total_expense = 0
     total_interest = 0
-    kakao_balance = 0
-    safebox_balance = 0
     internal_transfer_count = 0
 
     for trans in transactions:
@@ -273,38 +399,23 @@ def calculate_summary(transactions):
         trans['is_internal_transfer'] = is_internal_transfer(trans['description'])
 
         if trans['is_safe_box']:
-            if trans['type'] == 'income':
-                safebox_balance += trans['amount']
-            else:
-                safebox_balance -= trans['amount']
-        else:
-            # 내부 이체는 수입/지출 통계에서 제외
-            if trans['is_internal_transfer']:
-                internal_transfer_count += 1
-                # 잔액에는 반영
-                if trans['type'] == 'income':
-                    kakao_balance += trans['amount']
-                elif trans['type'] == 'expense':
-                    kakao_balance -= trans['amount']
-            else:
-                # 실제 수입/지출만 통계에 포함
-                if trans['type'] == 'income':
-                    total_income += trans['amount']
-                    if trans['category'] == '이자':
-                        total_interest += trans['amount']
-                    kakao_balance += trans['amount']
-                elif trans['type'] == 'expense':
-                    total_expense += trans['amount']
-                    kakao_balance -= trans['amount']
-
-    # 마지막 거래의 잔액 사용
-    kakao_transactions = [t for t in transactions if not t['is_safe_box']]
-    if kakao_transactions:
-        kakao_balance = kakao_transactions[-1]['balance_after']
-
-    safebox_transactions = [t for t in transactions if t['is_safe_box']]
-    if safebox_transactions:
-        safebox_balance = safebox_transactions[-1]['balance_after']
+            continue
+
+        # 내부 이체는 수입/지출 통계에서 제외 (잔액에는 반영)
+        if trans['is_internal_transfer']:
+            internal_transfer_count += 1
+        # 실제 수입/지출만 통계에 포함
+        elif trans['type'] == 'income':
+            total_income += trans['amount']
+            if trans['category'] == '이자':
+                total_interest += trans['amount']
+        elif trans['type'] == 'expense':
+            total_expense += trans['amount']
+
+    # 잔액은 잔액 엔진이 계산한 장부별 마지막 잔액 사용
+    balances = latest_balances(transactions)
+    kakao_balance = balances[MAIN_LEDGER]
+    safebox_balance = balances[SAFEBOX_LEDGER]
 
     print(f"\n내부 이체 거래: {internal_transfer_count}건 (통계에서 제외)")
 
@@ -319,45 +430,44 @@ def calculate_summary(transactions):
         'internal_transfers': internal_transfer_count
     }
 
-def create_dashboard_data(transactions, summary):
-    """대시보드 데이터 구조 생성"""
-    return {
+def create_dashboard_data(transactions, summary, accounts=None):
+    """대시보드 데이터 구조 생성
+
+    accounts를 지정하면 지정한 계좌만 포함 (다른 단체의 계좌 정보가 섞이지 않도록 기본값과 합치지 않음)
+    """
+    balances = {
+        'kakao_bank': summary['kakao_balance'],
+        'safe_box': summary['safebox_balance']
+    }
+    account_info = DEFAULT_ACCOUNTS if accounts is None else accounts
+
+    dashboard_data = {
         'accounts': {
-            'kakao_bank': {
-                'account_number': '3333-28-1790885',
-                'description': '카카오뱅크 저축예금',
-                'balance': summary['kakao_balance']
-            },
-            'safe_box': {
-                'description': '안전 자산 운용',
-                'balance': summary['safebox_balance']
-            },
-            'shinhan_bank': {
-                'account_number': '110-502-876387',
-                'description': '신한은행 (폐쇄)',
-                'balance': 0,
-                'is_closed': True
-            }
+            name: {**info, 'balance': balances.get(name, info.get('balance', 0))}
+            for name, info in account_info.items()
         },
         'summary': summary,
         'transactions': transactions,
         'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
-def main():
-    """메인 함수"""
-    print("="*60)
-    print("엑셀 데이터를 대시보드 JSON으로 변환")
-    print("="*60)
+    return dashboard_data
+
+def convert_workbooks(report_file, kakao_file=None, shinhan_file=None,
+                      output_file='dashboard_data.json', accounts=None, pretty=True):
+    """엑셀 파일들을 읽어 대시보드 JSON 생성
 
-    # 파일 경로
-    report_file = "사우회_회비_결산_보고서_최종.xlsx"
-    kakao_file = "251111_사우회회비 통장 거래 내역(카카오뱅크계좌).xlsx"
-    shinhan_file = "신한은행_거래내역조회_20251111111910.xls"
-    output_file = "dashboard_data.json"
+    병합된 중복 거래 전체 목록은 output_file과 같은 폴더의 dedup_report.json에 별도로 저장
+    """
+    # 이전 실행 결과 (잔액 체크포인트 재사용 및 차분 생성)
+    previous = load_snapshot(output_file)
+
+    # 은행 원본 내역은 한 번만 읽어 입금자명, 원본 거래, 보고 잔액에 함께 사용
+    df_kakao = read_kakao_export(kakao_file) if kakao_file else None
+    df_shinhan = read_shinhan_export(shinhan_file) if shinhan_file else None
 
     # 거래 내역 처리
-    transactions = process_all_transactions(report_file, kakao_file, shinhan_file)
+    transactions, checkpoints, merge_report = process_all_transactions(report_file, df_kakao, df_shinhan, previous)
 
     # 요약 통계 계산
     summary = calculate_summary(transactions)
@@ -371,14 +481,48 @@ def main():
     print(f"  총 잔액: ₩{summary['total_balance']:,}")
     print(f"  총 거래 건수: {summary['total_transactions']}건")
 
+    # 은행 보고 잔액과 대사
+    bank_balances = load_bank_balances(df_kakao, df_shinhan)
+    reconciliation = reconcile_balances(transactions, bank_balances)
+
+    print("\n잔액 대사:")
+    for bank, info in reconciliation['by_bank'].items():
+        status = '일치' if info['drift'] == 0 else f"차이 ₩{info['drift']:,} (최초 {info['first_drift_date']})"
+        print(f"  {bank}: 계산 ₩{info['computed_balance']:,} / 보고 ₩{info['reported_balance']:,} - {status}")
+
     # 대시보드 데이터 생성
-    dashboard_data = create_dashboard_data(transactions, summary)
+    dashboard_data = create_dashboard_data(transactions, summary, accounts)
+    dashboard_data['balance_checkpoints'] = checkpoints
+    dashboard_data['reconciliation'] = reconciliation
+    dashboard_data['dedup_report'] = {
+        'merged_count': merge_report['merged_count'],
+        'by_source': merge_report['by_source']
+    }
+
+    # JSON 파일로 저장 (이전 실행 대비 차분 파일 포함)
+    write_snapshot(dashboard_data, output_file, pretty=pretty, previous=previous)
 
-    # JSON 파일로 저장
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(dashboard_data, f, ensure_ascii=False, indent=2)
+    # 병합 내역 전체는 대시보드가 읽지 않으므로 별도 파일로 저장
+    dedup_report_file = os.path.join(os.path.dirname(output_file), DEDUP_REPORT_FILE)
+    dump_json(merge_report, dedup_report_file, pretty=pretty)
 
     print(f"\n✓ {output_file} 파일이 성공적으로 생성되었습니다!")
+
+    return dashboard_data
+
+def main():
+    """메인 함수"""
+    print("="*60)
+    print("엑셀 데이터를 대시보드 JSON으로 변환")
+    print("="*60)
+
+    convert_workbooks(
+        report_file="사우회_회비_결산_보고서_최종.xlsx",
+        kakao_file="251111_사우회회비 통장 거래 내역(카카오뱅크계좌).xlsx",
+        shinhan_file="신한은행_거래내역조회_20251111111910.xls",
+        output_file="dashboard_data.json"
+    )
+
     print("="*60)
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중복 거래 제거 - (날짜, 금액 구간, 계좌) 블로킹 후 블록 내부에서만 설명 유사도 비교
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# 금액 구간 크기와 허용 오차 (원)
+AMOUNT_BUCKET = 100
+AMOUNT_TOLERANCE = 100
+
+# 설명 유사도 기준
+SIMILARITY_THRESHOLD = 0.8
+
+# 은행마다 붙는 채널 접두사 (비교 시 제거)
+CHANNEL_PREFIXES = ['간편이체', '오픈뱅킹', '일반이체', '일반입금', '모바일', '인터넷', '카뱅오픈']
+
+def normalize_description(description):
+    """비교용 설명 정규화 (채널 접두사, 괄호, 공백, 기호 제거)"""
+    text = str(description or '').lower()
+    for prefix in CHANNEL_PREFIXES:
+        text = text.replace(prefix, '')
+    return re.sub(r'[^0-9a-z가-힣]', '', text)
+
+def account_of(transaction):
+    """블로킹용 계좌 키 (세이프박스는 별도 계좌)"""
+    return 'safe_box' if transaction['is_safe_box'] else transaction['bank']
+
+def blocking_key(transaction, bucket=None):
+    """블로킹 키: (날짜, 금액 구간, 계좌, 구분)"""
+    if bucket is None:
+        bucket = transaction['amount'] // AMOUNT_BUCKET
+    return (transaction['date'], bucket, account_of(transaction), transaction['type'])
+
+def description_similarity(a, b):
+    """정규화된 설명 유사도 (0~1)"""
+    if a == b:
+        return 1.0
+    if a and b and (a in b or b in a):
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+def merge_sources(sources):
+    """여러 출처의 거래를 병합하며 출처 간 중복 제거
+
+    sources: {출처 이름: 거래 리스트} (앞선 출처의 행을 우선 유지)
+    같은 출처 안의 동일 거래는 실제로 여러 번 발생한 것으로 보고 병합하지 않음
+    반환: (유지된 거래 리스트, 병합 기록 리스트 [(유지된 거래, 병합된 행 정보)])
+    """
+    kept = []
+    blocks = defaultdict(list)
+    merges = []
+
+    for source, transactions in sources.items():
+        # 한 출처의 행은 같은 출처의 다른 행과 병합되지 않도록 출처 단위로 블록에 반영
+        pending = []
+        for trans in transactions:
+            normalized = normalize_description(trans.get('description', ''))
+            bucket = trans['amount'] // AMOUNT_BUCKET
+
+            match = None
+            best = SIMILARITY_THRESHOLD
+            # 구간 경계의 금액 오차를 고려하여 인접 구간까지 조회
+            for b in (bucket - 1, bucket, bucket + 1):
+                for candidate in blocks.get(blocking_key(trans, b), []):
+                    kept_trans, kept_normalized, kept_source, matched = candidate
+                    if matched or abs(kept_trans['amount'] - trans['amount']) >= AMOUNT_TOLERANCE:
+                        continue
+                    score = description_similarity(normalized, kept_normalized)
+                    if score >= best:
+                        match, best = candidate, score
+
+            if match is None:
+                kept.append(trans)
+                pending.append((blocking_key(trans), [trans, normalized, source, False]))
+                continue
+
+            # 중복 행은 거래에 붙이지 않고 별도 병합 기록으로 남기며 한 번만 매칭
+            match[3] = True
+            kept_trans = match[0]
+            if not kept_trans.get('depositor_name') and trans.get('depositor_name'):
+                kept_trans['depositor_name'] = trans['depositor_name']
+            merges.append((kept_trans, {
+                'source': source,
+                'description': trans.get('description', ''),
+                'similarity': round(best, 3)
+            }))
+
+        for key, entry in pending:
+            blocks[key].append(entry)
+
+    return kept, merges
+
+def transaction_key(transaction):
+    """거래 ID의 기준이 되는 내용 키"""
+    return (
+        account_of(transaction), transaction['date'], transaction['type'], transaction['amount'],
+        normalize_description(transaction.get('description', ''))
+    )
+
+def transaction_id(key, occurrence):
+    """내용 키와 발생 순번으로 만든 12자리 ID"""
+    return hashlib.sha1('|'.join(map(str, key + (occurrence,))).encode('utf-8')).hexdigest()[:12]
+
+def assign_transaction_ids(transactions):
+    """내용 기반의 안정적인 거래 ID 부여 (동일 내용은 발생 순번으로 구분)"""
+    occurrences = defaultdict(int)
+    for trans in transactions:
+        key = transaction_key(trans)
+        trans['id'] = transaction_id(key, occurrences[key])
+        occurrences[key] += 1
+    return transactions
+
+def build_merge_report(merges):
+    """병합된 중복 거래 보고서 (merge_sources의 병합 기록, 거래 ID 부여 후 호출)"""
+    merged = [
+        {
+            'id': trans['id'],
+            'date': trans['date'],
+            'amount': trans['amount'],
+            'bank': trans['bank'],
+            'kept_description': trans['description'],
+            **dup
+        }
+        for trans, dup in merges
+    ]
+    by_source = defaultdict(int)
+    for entry in merged:
+        by_source[entry['source']] += 1
+    return {
+        'merged_count': len(merged),
+        'by_source': dict(by_source),
+        'merged': merged
+    }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+회비 납부 현황 엔진 - 회원 × 월 예정액/납부액 행렬, 미납액, 연속 납부, 월별 미납자 보고서
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+def load_dues_config(config_file='dues_config.json'):
+    """회비 설정 로드 (schedule: 회비 일정, members: 회원별 가입/탈퇴 월)
+
+    schedule은 [{'from': 'YYYY-MM', 'amount': 금액}] 형식으로, from 월부터 다음 일정 전까지 매월 amount 부과.
+    설정 파일이 없으면 schedule은 None (회칙을 알 수 없으므로 일정을 추측하지 않음)
+    """
+    config = {'schedule': None, 'members': {}}
+    if os.path.exists(config_file):
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    return config
+
+def member_payments_frame(transactions):
+    """회비로 인정되는 입금만 추출 (세이프박스, 내부 이체 제외)"""
+    rows = [
+        (t['member_name'], t['date'][:7], t['amount'])
+        for t in transactions
+        if t['type'] == 'income' and not t['is_safe_box']
+        and not t.get('is_internal_transfer', False) and t.get('member_name')
+    ]
+    return pd.DataFrame(rows, columns=['member', 'month', 'amount'])
+
+def expected_by_month(months, schedule):
+    """월별 예정 회비 (일정 시작 전은 0)"""
+    schedule = sorted(schedule, key=lambda s: s['from'])
+    starts = np.array([s['from'] for s in schedule])
+    amounts = np.array([s['amount'] for s in schedule] + [0])
+    # 일정 시작 전 월은 인덱스 -1 → 마지막 원소(0)
+    idx = np.searchsorted(starts, np.array(months), side='right') - 1
+    return amounts[idx]
+
+def _streaks(covered):
+    """충족 여부 배열의 현재 연속 개월 수와 최장 연속 개월 수"""
+    longest = 0
+    run = 0
+    for ok in covered:
+        run = run + 1 if ok else 0
+        longest = max(longest, run)
+    return run, longest
+
+def build_dues_matrix(transactions, members, schedule, member_terms=None,
+                      start_month=None, end_month=None):
+    """회원 × 월 예정액/납부액 행렬과 회원별 미납 현황 계산"""
+    member_terms = member_terms or {}
+
+    start_month = start_month or min(s['from'] for s in schedule)
+    if end_month is None and transactions:
+        end_month = max(t['date'][:7] for t in transactions)
+    months = []
+    if end_month is not None:
+        months = pd.period_range(start_month, end_month, freq='M').strftime('%Y-%m').tolist()
+
+    if not months:
+        # 거래가 없거나 기간이 비어 있으면 빈 행렬
+        return {
+            'schedule': schedule,
+            'months': [],
+            'members': list(members),
+            'expected': [[] for _ in members],
+            'paid': [[] for _ in members],
+            'members_status': {},
+            'unpaid_report': {'month': end_month, 'members': []}
+        }
+
+    month_array = np.array(months)
+    payments = member_payments_frame(transactions)
+
+    # 기간 밖 납부는 첫 달(선납 이월)과 마지막 달(선납)로 귀속
+    payments['month'] = payments['month'].where(payments['month'] >= start_month, start_month)
+    payments['month'] = payments['month'].where(payments['month'] <= end_month, end_month)
+    paid = (
+        payments.pivot_table(index='member', columns='month', values='amount', aggfunc='sum')
+        .reindex(index=members, columns=months)
+        .fillna(0)
+        .to_numpy(dtype=np.int64)
+    )
+
+    # 가입/탈퇴 기간 마스크 (회원 × 월)
+    joins = np.array([member_terms.get(m, {}).get('join') or start_month for m in members])
+    leaves = np.array([member_terms.get(m, {}).get('leave') or end_month for m in members])
+    active = (month_array[None, :] >= joins[:, None]) & (month_array[None, :] <= leaves[:, None])
+
+    expected = np.where(active, expected_by_month(months, schedule)[None, :], 0).astype(np.int64)
+
+    # 누적 기준으로 판단하여 선납/일괄 납부도 이후 달을 충족하도록 처리
+    cum_expected = expected.cumsum(axis=1)
+    cum_paid = paid.cumsum(axis=1)
+    covered = cum_paid >= cum_expected
+    # 현재 남은 미납: 지금까지의 납부액을 오래된 달부터 충당(FIFO)하고도 채우지 못한 달
+    owed = (expected > 0) & (cum_expected > cum_paid[:, -1:])
+
+    members_status = {}
+    for i, member in enumerate(members):
+        balance = int(cum_paid[i, -1] - cum_expected[i, -1])
+        unpaid_idx = np.flatnonzero(owed[i])
+        current_streak, longest_streak = _streaks(covered[i][active[i]])
+        members_status[member] = {
+            'expected_total': int(cum_expected[i, -1]),
+            'paid_total': int(cum_paid[i, -1]),
+            'arrears': max(-balance, 0),
+            'credit': max(balance, 0),
+            'unpaid_months': int(len(unpaid_idx)),
+            'first_unpaid_month': months[unpaid_idx[0]] if len(unpaid_idx) else None,
+            'current_streak': current_streak,
+            'longest_streak': longest_streak
+        }
+
+    # 마지막 달 기준 미납자 보고서 (남은 미납액이 있는 회원)
+    unpaid_now = [m for i, m in enumerate(members) if owed[i].any()]
+    unpaid_report = {
+        'month': end_month,
+        'members': sorted(
+            (
+                {
+                    'name': m,
+                    'arrears': members_status[m]['arrears'],
+                    'first_unpaid_month': members_status[m]['first_unpaid_month']
+                }
+                for m in unpaid_now
+            ),
+            key=lambda x: x['arrears'],
+            reverse=True
+        )
+    }
+
+    return {
+        'schedule': schedule,
+        'months': months,
+        'members': list(members),
+        'expected': expected.tolist(),
+        'paid': paid.tolist(),
+        'members_status': members_status,
+        'unpaid_report': unpaid_report
+    }
+
+if __name__ == "__main__":
+    with open('enhanced_dashboard_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    config = load_dues_config()
+    if not config['schedule']:
+        raise SystemExit("dues_config.json에 회비 일정(schedule)을 지정하세요")
+    dues = build_dues_matrix(data['transactions'], data['known_members'],
+                             config['schedule'], config['members'])
+
+    report = dues['unpaid_report']
+    print(f"{report['month']} 미납자: {len(report['members'])}명")
+    for entry in report['members']:
+        print(f"  - {entry['name']}: 미납 ₩{entry['arrears']:,} (최초 미납: {entry['first_unpaid_month']})")
@@ -5,11 +5,15 @@
 """
 
 import pandas as pd
-import json
 import re
 from datetime import datetime
 from collections import defaultdict
 
+from dues_engine import build_dues_matrix, load_dues_config
+from json_writer import load_json
+from rollup_cube import build_rollup_cube
+from snapshot_delta import write_snapshot
+
 # 회원 목록 (실제 데이터에서 추출된 이름들)
 KNOWN_MEMBERS = [
     '이동혁', '김민주', '박진복', '이광희', '이봉근', '문성환',
@@ -17,19 +21,22 @@ KNOWN_MEMBERS = [
     '권용현'
 ]
 
-def extract_member_name(description, depositor_name=''):
-    """거래 설명 또는 입금자명에서 회원 이름 추출"""
+def extract_member_name(description, depositor_name='', members=None):
+    """거래 설명 또는 입금자명에서 회원 이름 추출 (members 미지정 시 KNOWN_MEMBERS 사용)"""
+    if members is None:
+        members = KNOWN_MEMBERS
+
     # 1. 신한은행 입금자명에서 추출 (가장 신뢰도 높음)
     if depositor_name:
         # 괄호 안의 이름 추출
         match = re.search(r'\(([가-힣]{2,4})\)', depositor_name)
         if match:
             name = match.group(1)
-            if name in KNOWN_MEMBERS:
+            if name in members:
                 return name
 
         # 입금자명에서 직접 이름 추출
-        for member in KNOWN_MEMBERS:
+        for member in members:
             if member in depositor_name:
                 return member
 
@@ -38,7 +45,7 @@ def extract_member_name(description, depositor_name=''):
     match = re.search(r'\(([가-힣]{2,4})\)', description)
     if match:
         name = match.group(1)
-        if name in KNOWN_MEMBERS:
+        if name in members:
             return name
 
     # 간편이체, 오픈뱅킹 등의 접두사 제거 후 이름 추출
@@ -52,23 +59,23 @@ def extract_member_name(description, depositor_name=''):
         match = re.search(pattern, description)
         if match:
             name = match.group(1)
-            if name in KNOWN_MEMBERS:
+            if name in members:
                 return name
 
     # 이름이 단독으로 있는 경우
-    if description.strip() in KNOWN_MEMBERS:
+    if description.strip() in members:
         return description.strip()
 
     return None
 
-def categorize_expense(description, depositor_name=''):
+def categorize_expense(description, depositor_name='', members=None):
     """지출 카테고리 세분화"""
     desc_lower = description.lower()
 
     # 송금/이체
     if any(kw in description for kw in ['간편이체', '오픈뱅킹', '이체', '송금']):
         # 회원에게 송금
-        member = extract_member_name(description, depositor_name)
+        member = extract_member_name(description, depositor_name, members)
         if member:
             return f'회원 송금 ({member})'
         return '일반 송금'
@@ -91,25 +98,35 @@ def categorize_expense(description, depositor_name=''):
 
     return '기타 지출'
 
-def is_internal_transfer(transaction, all_transactions):
-    """계좌 간 내부 이체 여부 확인 (신한 → 카카오)"""
+def index_shinhan_expenses(transactions):
+    """날짜별 신한은행 출금액 목록 (내부 이체 확인용 색인)"""
+    index = defaultdict(list)
+    for t in transactions:
+        if t['bank'] == 'shinhan_bank' and t['type'] == 'expense':
+            index[t['date']].append(t['amount'])
+    return index
+
+def is_internal_transfer(transaction, all_transactions, shinhan_expenses=None):
+    """계좌 간 내부 이체 여부 확인 (신한 → 카카오)
+
+    shinhan_expenses: index_shinhan_expenses 결과 (여러 거래를 확인할 때 미리 만들어 전달)
+    """
     # 대체 거래는 내부 이체로 간주
     if '대체' in transaction.get('description', ''):
         return True
 
     # 신한은행 출금과 카카오뱅크 입금이 같은 날짜에 같은 금액으로 발생한 경우
     if transaction['bank'] == 'kakao_bank' and transaction['type'] == 'income':
+        if shinhan_expenses is None:
+            shinhan_expenses = index_shinhan_expenses(all_transactions)
         # 같은 날짜에 신한은행에서 같은 금액의 출금이 있는지 확인
-        for t in all_transactions:
-            if (t['bank'] == 'shinhan_bank' and
-                t['type'] == 'expense' and
-                t['date'] == transaction['date'] and
-                abs(t['amount'] - transaction['amount']) < 100):  # 금액 오차 허용
+        for amount in shinhan_expenses.get(transaction['date'], []):
+            if abs(amount - transaction['amount']) < 100:  # 금액 오차 허용
                 return True
 
     return False
 
-def categorize_income(description, depositor_name=''):
+def categorize_income(description, depositor_name='', members=None):
     """수입 카테고리 세분화"""
     desc_lower = description.lower()
 
@@ -118,7 +135,7 @@ def categorize_income(description, depositor_name=''):
         return '이자 수익'
 
     # 회비 납부
-    member = extract_member_name(description, depositor_name)
+    member = extract_member_name(description, depositor_name, members)
     if member:
         return f'회비 ({member})'
 
@@ -136,7 +153,7 @@ def categorize_income(description, depositor_name=''):
 
     return '기타 수입'
 
-def analyze_member_contributions(transactions):
+def analyze_member_contributions(transactions, members=None):
     """회원별 회비 납부 분석 (내부 이체 제외)"""
     member_data = defaultdict(lambda: {
         'total_paid': 0,
@@ -152,7 +169,7 @@ def analyze_member_contributions(transactions):
         if t['type'] == 'income' and not t['is_safe_box'] and not is_internal:
             # 입금자명 사용 (신한은행의 경우 실제 입금자명 포함)
             depositor_name = t.get('depositor_name', '')
-            member = extract_member_name(t['description'], depositor_name)
+            member = extract_member_name(t['description'], depositor_name, members)
             if member:
                 member_data[member]['total_paid'] += t['amount']
                 member_data[member]['payment_count'] += 1
@@ -179,7 +196,7 @@ def analyze_member_contributions(transactions):
 
     return dict(member_data)
 
-def analyze_expense_by_category(transactions):
+def analyze_expense_by_category(transactions, members=None):
     """카테고리별 지출 분석"""
     category_data = defaultdict(lambda: {
         'total': 0,
@@ -190,7 +207,7 @@ def analyze_expense_by_category(transactions):
     for t in transactions:
         if t['type'] == 'expense' and not t['is_safe_box']:
             depositor_name = t.get('depositor_name', '')
-            category = categorize_expense(t['description'], depositor_name)
+            category = categorize_expense(t['description'], depositor_name, members)
             category_data[category]['total'] += t['amount']
             category_data[category]['count'] += 1
             category_data[category]['transactions'].append({
@@ -202,7 +219,7 @@ def analyze_expense_by_category(transactions):
 
     return dict(category_data)
 
-def analyze_monthly_trends(transactions):
+def analyze_monthly_trends(transactions, members=None):
     """월별 상세 추이 분석 (내부 이체 제외)"""
     monthly_data = defaultdict(lambda: {
         'income': 0,
@@ -230,7 +247,7 @@ def analyze_monthly_trends(transactions):
             monthly_data[year_month]['income'] += t['amount']
             # 회비 납부 체크
             depositor_name = t.get('depositor_name', '')
-            if extract_member_name(t['description'], depositor_name):
+            if extract_member_name(t['description'], depositor_name, members):
                 monthly_data[year_month]['member_payments'] += t['amount']
                 monthly_data[year_month]['member_payment_count'] += 1
         elif t['type'] == 'expense':
@@ -246,56 +263,81 @@ def analyze_monthly_trends(transactions):
 
     return dict(monthly_data)
 
-def process_enhanced_data(input_file='dashboard_data.json', output_file='enhanced_dashboard_data.json'):
-    """향상된 데이터 처리"""
-    print("="*70)
-    print("향상된 데이터 처리 시작")
-    print("="*70)
-
-    # 기존 데이터 로드
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    transactions = data['transactions']
-
-    # 거래 데이터에 향상된 카테고리 추가 및 내부 이체 표시
-    print("\n거래 데이터 재분류 중...")
-
+def enhance_transactions(transactions, members=None):
+    """거래에 상세 카테고리, 회원 이름, 내부 이체 여부 추가 (내부 이체 건수 반환)"""
     # 1차: 카테고리 분류
     for t in transactions:
         depositor_name = t.get('depositor_name', '')
         if t['type'] == 'income':
-            t['detailed_category'] = categorize_income(t['description'], depositor_name)
-            member = extract_member_name(t['description'], depositor_name)
+            t['detailed_category'] = categorize_income(t['description'], depositor_name, members)
+            member = extract_member_name(t['description'], depositor_name, members)
             if member:
                 t['member_name'] = member
         elif t['type'] == 'expense':
-            t['detailed_category'] = categorize_expense(t['description'], depositor_name)
+            t['detailed_category'] = categorize_expense(t['description'], depositor_name, members)
 
-    # 2차: 내부 이체 표시
-    print("내부 이체 거래 식별 중...")
+    # 2차: 내부 이체 표시 (신한은행 출금을 날짜별로 색인하여 거래마다 전체를 다시 훑지 않음)
+    shinhan_expenses = index_shinhan_expenses(transactions)
     internal_transfer_count = 0
     for t in transactions:
         if not t['is_safe_box']:
-            t['is_internal_transfer'] = is_internal_transfer(t, transactions)
+            t['is_internal_transfer'] = is_internal_transfer(t, transactions, shinhan_expenses)
             if t['is_internal_transfer']:
                 internal_transfer_count += 1
         else:
             t['is_internal_transfer'] = False
 
+    return internal_transfer_count
+
+def process_enhanced_data(input_file='dashboard_data.json', output_file='enhanced_dashboard_data.json',
+                          members=None, dues_config_file='dues_config.json', pretty=True):
+    """향상된 데이터 처리 (members 미지정 시 KNOWN_MEMBERS 사용)"""
+    if members is None:
+        members = KNOWN_MEMBERS
+
+    print("="*70)
+    print("향상된 데이터 처리 시작")
+    print("="*70)
+
+    # 기존 데이터 로드
+    data = load_json(input_file)
+
+    transactions = data['transactions']
+
+    # 거래 데이터에 향상된 카테고리 추가 및 내부 이체 표시
+    print("\n거래 데이터 재분류 중...")
+    internal_transfer_count = enhance_transactions(transactions, members)
     print(f"  - 내부 이체 거래: {internal_transfer_count}건")
 
     # 회원별 분석
     print("회원별 회비 납부 분석 중...")
-    member_analysis = analyze_member_contributions(transactions)
+    member_analysis = analyze_member_contributions(transactions, members)
 
     # 카테고리별 지출 분석
     print("카테고리별 지출 분석 중...")
-    expense_analysis = analyze_expense_by_category(transactions)
+    expense_analysis = analyze_expense_by_category(transactions, members)
 
     # 월별 추이 분석
     print("월별 추이 분석 중...")
-    monthly_analysis = analyze_monthly_trends(transactions)
+    monthly_analysis = analyze_monthly_trends(transactions, members)
+
+    # 회비 납부 현황 (회원 × 월 예정액/납부액)
+    print("회비 납부 현황 계산 중...")
+    dues_config = load_dues_config(dues_config_file)
+    if dues_config['schedule']:
+        dues_status = build_dues_matrix(transactions, members,
+                                        dues_config['schedule'], dues_config['members'])
+        print(f"  - {dues_status['unpaid_report']['month']} 미납자: "
+              f"{len(dues_status['unpaid_report']['members'])}명")
+    else:
+        # 회비 일정을 모르면 미납액을 계산할 수 없으므로 생략
+        dues_status = None
+        print(f"  - 회비 일정이 설정되지 않아 생략 ({dues_config_file or '설정 파일 없음'})")
+
+    # 사전 집계 큐브 생성
+    print("집계 큐브 생성 중...")
+    rollup_cube = build_rollup_cube(transactions)
+    print(f"  - 큐브 셀: {len(rollup_cube['rows'])}개")
 
     # 향상된 데이터 구조 생성
     enhanced_data = {
@@ -303,13 +345,14 @@ def process_enhanced_data(input_file='dashboard_data.json', output_file='enhance
         'member_analysis': member_analysis,
         'expense_by_category': expense_analysis,
         'monthly_trends': monthly_analysis,
-        'known_members': KNOWN_MEMBERS,
+        'rollup_cube': rollup_cube,
+        'dues_status': dues_status,
+        'known_members': members,
         'enhanced_processing_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
-    # 저장
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(enhanced_data, f, ensure_ascii=False, indent=2)
+    # 저장 (이전 실행 대비 차분 파일 포함)
+    write_snapshot(enhanced_data, output_file, pretty=pretty)
 
     print(f"\n✓ {output_file} 파일이 성공적으로 생성되었습니다!")
 
@@ -319,7 +362,7 @@ def process_enhanced_data(input_file='dashboard_data.json', output_file='enhance
     print("="*70)
 
     print(f"\n회원 분석:")
-    print(f"  - 총 회원 수: {len(KNOWN_MEMBERS)}명")
+    print(f"  - 총 회원 수: {len(members)}명")
     print(f"  - 납부 기록이 있는 회원: {len(member_analysis)}명")
 
     total_member_payments = sum(m['total_paid'] for m in member_analysis.values())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 직렬화 - orjson이 설치되어 있으면 사용하고 없으면 표준 json으로 대체
+큰 배열은 청크 단위로 파일에 바로 기록하여 전체 문서를 메모리에 만들지 않음
+"""
+
+import gzip
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 이 길이 이상의 배열은 원소 단위로 나누어 기록
+STREAM_MIN_ITEMS = 256
+CHUNK_SIZE = 256
+
+# 정적 호스팅용 사전 압축 형식 (brotli는 설치된 경우에만)
+PRECOMPRESS = ('gzip', 'br')
+# brotli 최고 품질(11)은 몇 배 느리고 크기 이득은 작음
+BROTLI_QUALITY = 9
+# 사전 압축 시 한 번에 읽는 크기
+COMPRESS_BLOCK_SIZE = 1 << 20
+
+INDENT = '  '
+
+def _encoder(pretty):
+    """값 하나를 UTF-8 바이트로 인코딩하는 함수"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return lambda value: orjson.dumps(value, option=option)
+
+    if pretty:
+        return lambda value: json.dumps(value, ensure_ascii=False, indent=2).encode('utf-8')
+    return lambda value: json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _indent(encoded, level, pretty):
+    """인코딩된 값의 줄마다 들여쓰기 추가 (JSON 문자열 안에는 개행 문자가 그대로 나올 수 없음)"""
+    if pretty and level:
+        return encoded.replace(b'\n', b'\n' + (INDENT * level).encode())
+    return encoded
+
+def _iter_fragments(value, level, pretty, encode):
+    """값을 JSON 조각(bytes)으로 나누어 생성 (dict는 키 단위, 큰 배열은 청크 단위)"""
+    is_large_list = isinstance(value, list) and len(value) >= STREAM_MIN_ITEMS
+    if not (isinstance(value, dict) and value) and not is_large_list:
+        yield _indent(encode(value), level, pretty)
+        return
+
+    open_char, close_char = (b'{', b'}') if isinstance(value, dict) else (b'[', b']')
+    newline = ('\n' + INDENT * (level + 1)).encode() if pretty else b''
+    separator = b': ' if pretty else b':'
+
+    yield open_char
+    if isinstance(value, dict):
+        for i, (key, item) in enumerate(value.items()):
+            yield (b',' if i else b'') + newline + json.dumps(str(key), ensure_ascii=False).encode('utf-8') + separator
+            yield from _iter_fragments(item, level + 1, pretty, encode)
+    else:
+        for start in range(0, len(value), CHUNK_SIZE):
+            chunk = value[start:start + CHUNK_SIZE]
+            yield b''.join(
+                (b',' if start + i else b'') + newline + _indent(encode(item), level + 1, pretty)
+                for i, item in enumerate(chunk)
+            )
+    yield (('\n' + INDENT * level).encode() if pretty else b'') + close_char
+
+def _iter_blocks(f):
+    """파일을 COMPRESS_BLOCK_SIZE 단위로 읽기"""
+    while True:
+        block = f.read(COMPRESS_BLOCK_SIZE)
+        if not block:
+            return
+        yield block
+
+def dump_json(data, output_file, pretty=True, compress=()):
+    """JSON 파일 저장 (임시 파일에 스트리밍 후 교체, 필요 시 .gz/.br 사전 압축본 생성)"""
+    encode = _encoder(pretty)
+    temp_file = f'{output_file}.tmp'
+
+    try:
+        with open(temp_file, 'wb') as f:
+            for fragment in _iter_fragments(data, 0, pretty, encode):
+                f.write(fragment)
+        os.replace(temp_file, output_file)
+    finally:
+        # 인코딩 실패 시 임시 파일 정리 (기존 출력 파일은 그대로 유지)
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    written = [output_file]
+    if 'gzip' in compress:
+        with open(output_file, 'rb') as src, gzip.GzipFile(f'{output_file}.gz', 'wb', mtime=0) as dst:
+            for block in _iter_blocks(src):
+                dst.write(block)
+        written.append(f'{output_file}.gz')
+    if 'br' in compress and brotli is not None:
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        with open(output_file, 'rb') as src, open(f'{output_file}.br', 'wb') as dst:
+            for block in _iter_blocks(src):
+                dst.write(compressor.process(block))
+            dst.write(compressor.finish())
+        written.append(f'{output_file}.br')
+
+    return written
+
+def load_json(input_file):
+    """JSON 파일 로드"""
+    with open(input_file, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
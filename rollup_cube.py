@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사전 집계 큐브 생성 스크립트 - 년도 × 월 × 계좌 × 구분 × 카테고리 × 회원 × 이체 구분별 합계/건수
+"""
+
+import json
+import pandas as pd
+
+# 큐브 차원 (순서가 rows 배열의 컬럼 순서)
+CUBE_DIMENSIONS = ['year', 'month', 'account', 'type', 'category', 'detailed_category', 'member', 'transfer']
+CUBE_MEASURES = ['amount', 'count']
+CUBE_VERSION = 1
+
+def classify_transfer(transaction):
+    """이체 구분 결정 (none: 일반 거래, replacement: '대체' 거래, matched: 은행 간 매칭 이체)"""
+    if '대체' in transaction.get('description', ''):
+        return 'replacement'
+    if transaction.get('is_internal_transfer', False):
+        return 'matched'
+    return 'none'
+
+def build_rollup_cube(transactions):
+    """거래 내역을 한 번의 groupby로 집계하여 압축 큐브 생성"""
+    if not transactions:
+        return {
+            'version': CUBE_VERSION,
+            'dimensions': CUBE_DIMENSIONS,
+            'measures': CUBE_MEASURES,
+            'values': {dim: [] for dim in CUBE_DIMENSIONS},
+            'rows': []
+        }
+
+    df = pd.DataFrame({
+        'date': [t['date'] for t in transactions],
+        'amount': [t['amount'] for t in transactions],
+        # 세이프박스는 별도 계좌로 취급
+        'account': ['safe_box' if t['is_safe_box'] else t['bank'] for t in transactions],
+        'type': [t['type'] for t in transactions],
+        # summary의 이자 집계는 기본 category 기준이므로 두 카테고리를 모두 유지
+        'category': [t.get('category', '') for t in transactions],
+        'detailed_category': [t.get('detailed_category', '') for t in transactions],
+        'member': [t.get('member_name', '') for t in transactions],
+        'transfer': [classify_transfer(t) for t in transactions],
+    })
+    df['year'] = df['date'].str[:4].astype(int)
+    df['month'] = df['date'].str[5:7].astype(int)
+
+    grouped = (
+        df.groupby(CUBE_DIMENSIONS, sort=True)['amount']
+        .agg(['sum', 'count'])
+        .reset_index()
+    )
+
+    # 차원 값을 사전(dictionary) 인덱스로 인코딩
+    values = {}
+    codes = []
+    for dim in CUBE_DIMENSIONS:
+        uniques = sorted(grouped[dim].unique().tolist())
+        values[dim] = uniques
+        codes.append(grouped[dim].map({v: i for i, v in enumerate(uniques)}).tolist())
+
+    sums = grouped['sum'].astype(int).tolist()
+    counts = grouped['count'].astype(int).tolist()
+    rows = [list(r) for r in zip(*codes, sums, counts)]
+
+    return {
+        'version': CUBE_VERSION,
+        'dimensions': CUBE_DIMENSIONS,
+        'measures': CUBE_MEASURES,
+        'values': values,
+        'rows': rows
+    }
+
+def cube_to_frame(cube):
+    """큐브를 디코딩된 DataFrame으로 변환"""
+    columns = cube['dimensions'] + cube['measures']
+    df = pd.DataFrame(cube['rows'], columns=columns)
+    for dim in cube['dimensions']:
+        lookup = cube['values'][dim]
+        df[dim] = df[dim].map(lambda i: lookup[i])
+    return df
+
+def slice_cube(cube, **filters):
+    """큐브 슬라이스 합계 (필터 값은 단일 값 또는 리스트)"""
+    df = cube_to_frame(cube)
+    mask = pd.Series(True, index=df.index)
+    for dim, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            mask &= df[dim].isin(list(value))
+        else:
+            mask &= df[dim] == value
+    selected = df[mask]
+    return {
+        'amount': int(selected['amount'].sum()),
+        'count': int(selected['count'].sum())
+    }
+
+def summary_from_cube(cube):
+    """큐브 슬라이스만으로 요약 통계 재구성 (calculate_summary와 동일한 규칙)"""
+    bank_accounts = ['kakao_bank', 'shinhan_bank']
+    regular = ['none', 'matched']
+
+    income = slice_cube(cube, account=bank_accounts, type='income')
+    expense = slice_cube(cube, account=bank_accounts, type='expense')
+    safebox_in = slice_cube(cube, account='safe_box', type='income')
+    safebox_all = slice_cube(cube, account='safe_box')
+    internal = slice_cube(cube, account=bank_accounts, transfer='replacement')
+
+    kakao_balance = income['amount'] - expense['amount']
+    safebox_balance = safebox_in['amount'] - (safebox_all['amount'] - safebox_in['amount'])
+
+    return {
+        'total_income': slice_cube(cube, account=bank_accounts, type='income', transfer=regular)['amount'],
+        'total_expense': slice_cube(cube, account=bank_accounts, type='expense', transfer=regular)['amount'],
+        'total_interest': slice_cube(cube, account=bank_accounts, type='income', transfer=regular,
+                                     category='이자')['amount'],
+        'kakao_balance': kakao_balance,
+        'safebox_balance': safebox_balance,
+        'total_balance': kakao_balance + safebox_balance,
+        'total_transactions': slice_cube(cube)['count'],
+        'internal_transfers': internal['count']
+    }
+
+if __name__ == "__main__":
+    with open('enhanced_dashboard_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    cube = data.get('rollup_cube') or build_rollup_cube(data['transactions'])
+    print(f"큐브 셀 수: {len(cube['rows'])}개 (거래 {len(data['transactions'])}건)")
+
+    summary = summary_from_cube(cube)
+    for key, value in summary.items():
+        match = '✓' if data['summary'].get(key) == value else '✗'
+        print(f"  {match} {key}: {value:,}")
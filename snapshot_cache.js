@@ -0,0 +1,91 @@
+// 스냅샷 캐시 - 이전 방문 때 저장한 데이터에 차분(delta) 파일만 적용하여 재다운로드 최소화
+// 차분 규칙은 snapshot_delta.py의 apply_delta와 동일
+
+const SNAPSHOT_CACHE_PREFIX = 'snapshot_cache:';
+
+// 캐시된 스냅샷에 차분 적용
+function applySnapshotDelta(data, delta) {
+    const txDelta = delta.transactions;
+    const removed = new Set(txDelta.removed);
+    const changed = new Map(txDelta.changed.map(t => [t.id, t]));
+
+    const transactions = (data.transactions || [])
+        .filter(t => !removed.has(t.id))
+        .map(t => changed.get(t.id) || t);
+    txDelta.added.forEach(entry => {
+        transactions.splice(entry.index, 0, entry.transaction);
+    });
+
+    const result = { ...data };
+    Object.entries(delta.aggregates.removed).forEach(([key, subkeys]) => {
+        if (subkeys.length === 1 && subkeys[0] === '*') {
+            delete result[key];
+        } else {
+            result[key] = { ...result[key] };
+            subkeys.forEach(k => delete result[key][k]);
+        }
+    });
+    Object.entries(delta.aggregates.changed).forEach(([key, values]) => {
+        if ('*' in values) {
+            result[key] = values['*'];
+        } else {
+            result[key] = { ...(result[key] || {}), ...values };
+        }
+    });
+    result.transactions = transactions;
+
+    return result;
+}
+
+// 스냅샷 로드: 캐시 버전이 맞으면 차분만 받아 적용, 아니면 전체 파일 로드
+async function loadSnapshot(file) {
+    // 같은 출처의 다른 경로(다른 단체의 출력 폴더 등)에 있는 같은 이름의 파일과 캐시가 섞이지 않도록 절대 URL로 구분
+    const cacheKey = SNAPSHOT_CACHE_PREFIX + new URL(file, location.href).href;
+    const deltaFile = file.replace(/\.json$/, '.delta.json');
+
+    let cached = null;
+    try {
+        cached = JSON.parse(localStorage.getItem(cacheKey));
+    } catch (e) {
+        cached = null;
+    }
+
+    if (cached) {
+        try {
+            const response = await fetch(deltaFile, { cache: 'no-cache' });
+            if (response.ok) {
+                const delta = await response.json();
+                if (cached.snapshot_version === delta.to_version) {
+                    console.log(`${file}: 캐시가 최신 버전입니다 (v${delta.to_version})`);
+                    return cached;
+                }
+                if (cached.snapshot_version === delta.from_version) {
+                    console.log(`${file}: 차분 적용 v${delta.from_version} → v${delta.to_version}`);
+                    const updated = applySnapshotDelta(cached, delta);
+                    saveSnapshotCache(cacheKey, updated);
+                    return updated;
+                }
+            }
+        } catch (e) {
+            console.log(`${file}: 차분 파일 없음, 전체 파일 로드`);
+        }
+    }
+
+    const response = await fetch(file, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`${file} 로드 실패 (${response.status})`);
+    }
+    const data = await response.json();
+    saveSnapshotCache(cacheKey, data);
+    return data;
+}
+
+// 캐시 저장 (저장 공간 부족 시 캐시 없이 진행)
+function saveSnapshotCache(cacheKey, data) {
+    try {
+        localStorage.setItem(cacheKey, JSON.stringify(data));
+    } catch (e) {
+        console.log('스냅샷 캐시 저장 실패:', e);
+        localStorage.removeItem(cacheKey);
+    }
+}
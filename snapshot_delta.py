@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스냅샷/차분 출력 - 이전 실행 결과와 비교하여 변경분(delta) 파일 생성
+"""
+
+import hashlib
+import json
+import os
+
+from json_writer import PRECOMPRESS, dump_json, load_json
+
+def delta_file_for(output_file):
+    """스냅샷 파일에 대응하는 차분 파일 경로 (dashboard_data.json → dashboard_data.delta.json)"""
+    root, ext = os.path.splitext(output_file)
+    return f'{root}.delta{ext}'
+
+def snapshot_version(data):
+    """스냅샷 내용으로 만든 12자리 버전 (출력 폴더나 실행 횟수와 무관하게 내용이 같으면 같은 버전)"""
+    digest = hashlib.sha1()
+    encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    for chunk in encoder.iterencode({key: value for key, value in data.items() if key != 'snapshot_version'}):
+        digest.update(chunk.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def load_snapshot(snapshot_file):
+    """이전 스냅샷 로드 (없거나 손상된 경우 None)"""
+    if not os.path.exists(snapshot_file):
+        return None
+    try:
+        return load_json(snapshot_file)
+    except (OSError, ValueError):
+        return None
+
+def diff_transactions(old_transactions, new_transactions):
+    """거래 ID 기준 추가/변경/삭제 목록 (추가 행은 새 목록에서의 위치 포함)"""
+    old_by_id = {t['id']: t for t in old_transactions}
+    new_ids = set()
+
+    added = []
+    changed = []
+    for index, trans in enumerate(new_transactions):
+        new_ids.add(trans['id'])
+        old = old_by_id.get(trans['id'])
+        if old is None:
+            added.append({'index': index, 'transaction': trans})
+        elif old != trans:
+            changed.append(trans)
+
+    removed = [t['id'] for t in old_transactions if t['id'] not in new_ids]
+
+    # 남은 거래의 순서가 바뀐 경우 위치 기반 삽입으로 복원할 수 없으므로 전체 교체
+    kept_old_order = [t['id'] for t in old_transactions if t['id'] in new_ids]
+    kept_new_order = [t['id'] for t in new_transactions if t['id'] in old_by_id]
+    if kept_old_order != kept_new_order:
+        return {
+            'added': [{'index': index, 'transaction': trans} for index, trans in enumerate(new_transactions)],
+            'changed': [],
+            'removed': [t['id'] for t in old_transactions]
+        }
+
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+def diff_aggregates(old_data, new_data):
+    """거래 외 항목의 변경 키 (딕셔너리는 하위 키 단위로 비교)"""
+    changed = {}
+    removed = {}
+
+    for key, value in new_data.items():
+        if key == 'transactions':
+            continue
+        old_value = old_data.get(key)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            sub_changed = {k: v for k, v in value.items() if old_value.get(k) != v or k not in old_value}
+            sub_removed = [k for k in old_value if k not in value]
+            if sub_changed:
+                changed[key] = sub_changed
+            if sub_removed:
+                removed[key] = sub_removed
+        elif old_value != value or key not in old_data:
+            # 하위 키 단위가 아닌 통째 교체는 '*'로 표시
+            changed[key] = {'*': value}
+
+    for key in old_data:
+        if key != 'transactions' and key not in new_data:
+            removed[key] = ['*']
+
+    return {'changed': changed, 'removed': removed}
+
+def build_delta(old_data, new_data):
+    """두 스냅샷 사이의 차분"""
+    return {
+        'from_version': old_data.get('snapshot_version', 0),
+        'to_version': new_data['snapshot_version'],
+        'transactions': diff_transactions(old_data.get('transactions', []), new_data.get('transactions', [])),
+        'aggregates': diff_aggregates(old_data, new_data)
+    }
+
+def apply_delta(data, delta):
+    """캐시된 스냅샷에 차분 적용 (브라우저의 applyDelta와 동일한 규칙)"""
+    if data.get('snapshot_version', 0) != delta['from_version']:
+        raise ValueError(
+            f"스냅샷 버전 불일치: {data.get('snapshot_version', 0)} != {delta['from_version']}"
+        )
+
+    tx_delta = delta['transactions']
+    removed = set(tx_delta['removed'])
+    changed = {t['id']: t for t in tx_delta['changed']}
+    transactions = [changed.get(t['id'], t) for t in data.get('transactions', []) if t['id'] not in removed]
+    for entry in tx_delta['added']:
+        transactions.insert(entry['index'], entry['transaction'])
+
+    result = {key: value for key, value in data.items() if key != 'transactions'}
+    for key, subkeys in delta['aggregates']['removed'].items():
+        if subkeys == ['*']:
+            result.pop(key, None)
+        else:
+            result[key] = {k: v for k, v in result[key].items() if k not in subkeys}
+    for key, values in delta['aggregates']['changed'].items():
+        if '*' in values:
+            result[key] = values['*']
+        else:
+            result[key] = {**result.get(key, {}), **values}
+    result['transactions'] = transactions
+
+    return result
+
+def write_snapshot(data, output_file, pretty=True, previous=None):
+    """전체 스냅샷과 이전 실행 대비 차분 파일을 함께 저장 (previous 미지정 시 output_file에서 로드)"""
+    if previous is None:
+        previous = load_snapshot(output_file)
+    data['snapshot_version'] = snapshot_version(data)
+
+    dump_json(data, output_file, pretty=pretty, compress=PRECOMPRESS)
+
+    delta_file = delta_file_for(output_file)
+    if previous is None or 'id' not in (previous.get('transactions') or [{}])[0]:
+        # 비교할 이전 스냅샷이 없으면 차분 파일을 지워 전체 로드를 유도
+        for stale in (delta_file, f'{delta_file}.gz', f'{delta_file}.br'):
+            if os.path.exists(stale):
+                os.remove(stale)
+        return None
+
+    delta = build_delta(previous, data)
+    dump_json(delta, delta_file, pretty=False, compress=PRECOMPRESS)
+
+    tx_delta = delta['transactions']
+    print(f"  - 차분: 추가 {len(tx_delta['added'])}건, 변경 {len(tx_delta['changed'])}건, "
+          f"삭제 {len(tx_delta['removed'])}건, 변경 항목 {len(delta['aggregates']['changed'])}개")
+    return delta
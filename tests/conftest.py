@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 파이프라인 테스트 공통 설정
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 파이프라인 스크립트는 저장소 최상위 모듈
+sys.path.insert(0, REPO_ROOT)
+
+REPORT_FILE = os.path.join(REPO_ROOT, "사우회_회비_결산_보고서_최종.xlsx")
+KAKAO_FILE = os.path.join(REPO_ROOT, "251111_사우회회비 통장 거래 내역(카카오뱅크계좌).xlsx")
+SHINHAN_FILE = os.path.join(REPO_ROOT, "신한은행_거래내역조회_20251111111910.xls")
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'perf: 시간/메모리 예산 테스트')
+
+@pytest.fixture(scope='session')
+def pipeline_dir(tmp_path_factory):
+    """동봉된 엑셀 파일로 전체 파이프라인을 실행한 출력 폴더"""
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlrd')
+
+    from convert_excel_to_json import convert_workbooks
+    from enhanced_data_processor import process_enhanced_data
+
+    output_dir = tmp_path_factory.mktemp('pipeline')
+    dashboard_file = str(output_dir / 'dashboard_data.json')
+    enhanced_file = str(output_dir / 'enhanced_dashboard_data.json')
+
+    with redirect_stdout(io.StringIO()):
+        convert_workbooks(REPORT_FILE, KAKAO_FILE, SHINHAN_FILE, output_file=dashboard_file)
+        process_enhanced_data(dashboard_file, enhanced_file,
+                              dues_config_file=str(output_dir / 'dues_config.json'))
+
+    return output_dir
+
+@pytest.fixture(scope='session')
+def pipeline_outputs(pipeline_dir):
+    """전체 파이프라인 실행 결과 (dashboard, enhanced)"""
+    from json_writer import load_json
+
+    return (load_json(str(pipeline_dir / 'dashboard_data.json')),
+            load_json(str(pipeline_dir / 'enhanced_dashboard_data.json')))
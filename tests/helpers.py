@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+테스트용 합성 거래 내역 생성 및 결과 정규화
+"""
+
+import random
+
+from balance_engine import compute_running_balances
+from convert_excel_to_json import determine_category
+from enhanced_data_processor import KNOWN_MEMBERS
+
+# 실행 시각 등 매번 바뀌는 항목 (골든 파일 비교에서 제외)
+VOLATILE_KEYS = ('last_updated', 'enhanced_processing_date', 'snapshot_version')
+
+DESCRIPTIONS = (
+    [f'간편이체({name})' for name in KNOWN_MEMBERS]
+    + list(KNOWN_MEMBERS)
+    + ['대체', '(주)센벡스 대체', '입출금통장 이자', 'ATM출금', '체크카드', '모바일', '수수료', '신한카드', '사우회 회비']
+)
+
+def normalize_output(data):
+    """실행마다 달라지는 항목 제거"""
+    return {key: value for key, value in data.items() if key not in VOLATILE_KEYS}
+
+def make_transaction(rng, date):
+    """convert_excel_to_json 출력과 같은 형태의 거래 하나 생성"""
+    is_safe_box = rng.random() < 0.1
+    trans = {
+        'date': date,
+        'amount': rng.choice([50000, 100000, 200000, rng.randint(1, 5_000_000)]),
+        'description': '세이프박스' if is_safe_box else rng.choice(DESCRIPTIONS),
+        'bank': 'kakao_bank' if is_safe_box or rng.random() < 0.6 else 'shinhan_bank',
+        'is_safe_box': is_safe_box,
+        'depositor_name': '',
+        'type': rng.choice(['income', 'expense']),
+        'balance_after': 0
+    }
+    if trans['bank'] == 'shinhan_bank' and rng.random() < 0.5:
+        trans['depositor_name'] = rng.choice(KNOWN_MEMBERS)
+    trans['category'] = '세이프박스' if is_safe_box else determine_category(trans)
+    return trans
+
+def make_ledger(n, seed=0, start_year=2019, years=7):
+    """날짜순 정렬되고 잔액이 계산된 합성 거래 n건"""
+    rng = random.Random(seed)
+    transactions = []
+    for _ in range(n):
+        date = f'{start_year + rng.randrange(years)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+        transactions.append(make_transaction(rng, date))
+    transactions.sort(key=lambda t: t['date'])
+    compute_running_balances(transactions)
+    return transactions
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+일괄 처리 설정 검증, 단체별 계좌 정보 분리, 일괄 실행 테스트
+"""
+
+import io
+import json
+import os
+from contextlib import redirect_stdout
+
+import pytest
+
+from batch_runner import load_batch_config, print_timing_report, run_batch
+from conftest import KAKAO_FILE, REPO_ROOT, REPORT_FILE, SHINHAN_FILE
+from convert_excel_to_json import DEFAULT_ACCOUNTS, create_dashboard_data
+
+SUMMARY = {'kakao_balance': 1000, 'safebox_balance': 500}
+
+def _org(name, **extra):
+    return {
+        'name': name,
+        'report_file': f'{name}.xlsx',
+        'accounts': {'kakao_bank': {'account_number': f'{name}-0000', 'description': name}},
+        'members': [f'{name} 회원'],
+        **extra
+    }
+
+def _write_config(tmp_path, organizations):
+    config_file = tmp_path / 'organizations.json'
+    config_file.write_text(json.dumps({'organizations': organizations}, ensure_ascii=False), encoding='utf-8')
+    return str(config_file)
+
+def test_example_config_is_valid():
+    config, _ = load_batch_config(os.path.join(REPO_ROOT, 'organizations.example.json'))
+    assert [org['name'] for org in config['organizations']] == ['사우회', '동호회']
+
+@pytest.mark.parametrize('organizations, message', [
+    ([], '단체'),
+    ([_org('a'), _org('a', output_dir='other')], 'name'),
+    ([_org('a', output_dir='out'), _org('b', output_dir='./out/')], 'output_dir'),
+    ([_org('a', output_dir='output/b'), _org('b')], 'output_dir'),
+    ([_org('a'), {**_org('b'), 'accounts': {}}], 'accounts'),
+    ([_org('a'), {key: value for key, value in _org('b').items() if key != 'members'}], 'members'),
+    ([_org('a', members=[])], 'members'),
+])
+def test_invalid_batch_config_rejected(tmp_path, organizations, message):
+    with pytest.raises(ValueError, match=message):
+        load_batch_config(_write_config(tmp_path, organizations))
+
+def test_configured_accounts_replace_defaults():
+    accounts = {'kakao_bank': {'account_number': '3333-00-0000000', 'description': '동호회 회비 통장'}}
+    data = create_dashboard_data([], SUMMARY, accounts)
+
+    # 다른 단체(사우회)의 계좌 정보가 섞이지 않음
+    assert data['accounts'] == {
+        'kakao_bank': {'account_number': '3333-00-0000000', 'description': '동호회 회비 통장', 'balance': 1000}
+    }
+    assert 'shinhan_bank' in DEFAULT_ACCOUNTS and 'balance' not in DEFAULT_ACCOUNTS['kakao_bank']
+
+def test_default_accounts_used_without_config():
+    data = create_dashboard_data([], SUMMARY)
+    assert set(data['accounts']) == set(DEFAULT_ACCOUNTS)
+    assert data['accounts']['safe_box']['balance'] == 500
+    assert data['accounts']['shinhan_bank']['balance'] == 0
+
+def test_run_batch_isolates_failing_organization(tmp_path):
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlrd')
+    ok = _org('정상', report_file=REPORT_FILE, kakao_file=KAKAO_FILE, shinhan_file=SHINHAN_FILE)
+    broken = _org('파일없음', kakao_file='없는_카카오뱅크.xlsx')
+
+    with redirect_stdout(io.StringIO()):
+        report = run_batch(_write_config(tmp_path, [ok, broken]), workers=2)
+
+    # 두 단체가 작업 프로세스 2개로 동시에 처리되고, 한 단체의 실패가 다른 단체를 멈추지 않음
+    assert report['workers'] == 2
+    assert (report['succeeded'], report['failed']) == (1, 1)
+    succeeded, failed = report['organizations']
+    assert (succeeded['name'], succeeded['status'], succeeded['error']) == ('정상', 'ok', None)
+    assert (failed['name'], failed['status']) == ('파일없음', 'failed')
+    assert failed['error'].startswith('FileNotFoundError')
+
+    output_dir = tmp_path / 'output' / '정상'
+    for name in ('dashboard_data.json', 'enhanced_dashboard_data.json', 'batch.log'):
+        assert (output_dir / name).exists()
+
+    # 성공한 단체는 단계별 시간, 실패한 단체는 전체 시간만 기록
+    assert set(succeeded['timings']) == {'convert', 'enhanced', 'total'}
+    assert succeeded['timings']['total'] >= succeeded['timings']['convert'] + succeeded['timings']['enhanced']
+    assert set(failed['timings']) == {'total'}
+    assert report['total_org_time'] == pytest.approx(succeeded['timings']['total'] + failed['timings']['total'])
+    assert report['wall_time'] > 0
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        print_timing_report(report)
+    assert '정상' in output.getvalue() and '파일없음' in output.getvalue()
+    assert '성공 1곳 / 실패 1곳' in output.getvalue()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+결산 보고서와 은행 원본 내역 병합 테스트 (동봉된 엑셀 파일 사용)
+"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import KAKAO_FILE, SHINHAN_FILE
+from convert_excel_to_json import (
+    DEDUP_REPORT_FILE, load_kakao_transactions, load_shinhan_transactions,
+    read_kakao_export, read_shinhan_export
+)
+from dedup_engine import merge_sources
+from json_writer import load_json
+
+REPORT_KEYS = ('date', 'amount', 'description', 'bank', 'is_safe_box', 'type')
+
+def _raw_sources():
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlrd')
+    with redirect_stdout(io.StringIO()):
+        return {
+            '카카오뱅크 원본': load_kakao_transactions(read_kakao_export(KAKAO_FILE)),
+            '신한은행 원본': load_shinhan_transactions(read_shinhan_export(SHINHAN_FILE))
+        }
+
+def test_raw_exports_merge_into_report_rows(pipeline_outputs, pipeline_dir):
+    dashboard, _ = pipeline_outputs
+    raw = _raw_sources()
+    report = load_json(str(pipeline_dir / DEDUP_REPORT_FILE))
+
+    # 원본의 모든 행이 보고서 행과 병합되고 추가 거래는 없음
+    assert report['by_source'] == {name: len(rows) for name, rows in raw.items()}
+    assert len(dashboard['transactions']) == sum(len(rows) for rows in raw.values())
+    assert sorted(entry['id'] for entry in report['merged']) == sorted(t['id'] for t in dashboard['transactions'])
+
+def test_dashboard_keeps_only_merge_counts(pipeline_outputs, pipeline_dir):
+    dashboard, enhanced = pipeline_outputs
+    report = load_json(str(pipeline_dir / DEDUP_REPORT_FILE))
+
+    # 병합 내역은 별도 파일에만 기록하고 거래와 대시보드에는 건수만 남김
+    assert dashboard['dedup_report'] == {'merged_count': report['merged_count'], 'by_source': report['by_source']}
+    assert not any('duplicates' in t for t in dashboard['transactions'] + enhanced['transactions'])
+
+def test_rows_missing_from_report_are_added_from_raw_exports(pipeline_outputs):
+    dashboard, _ = pipeline_outputs
+    last_month = dashboard['transactions'][-1]['date'][:7]
+
+    # 보고서가 마지막 달 이전까지만 작성된 경우
+    report_rows = [
+        {key: t[key] for key in REPORT_KEYS}
+        for t in dashboard['transactions'] if t['date'][:7] < last_month
+    ]
+    missing = len(dashboard['transactions']) - len(report_rows)
+    assert missing > 0
+
+    kept, merged = merge_sources({'전체 거래 내역': report_rows, **_raw_sources()})
+
+    added = kept[len(report_rows):]
+    assert len(added) == missing
+    assert all(t['date'][:7] == last_month for t in added)
+    assert len(merged) == len(report_rows)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+회비 납부 현황 엔진 테스트 (미납액, 선납, 연속 납부, 가입/탈퇴 기간, 최초 미납월)
+"""
+
+import pytest
+
+from dues_engine import build_dues_matrix
+
+MONTHLY = [{'from': '2024-01', 'amount': 10000}]
+
+def _payment(month, amount, member='회원', **extra):
+    return {
+        'date': f'{month}-15', 'amount': amount, 'type': 'income', 'is_safe_box': False,
+        'is_internal_transfer': False, 'member_name': member, **extra
+    }
+
+def _status(payments, schedule=MONTHLY, terms=None):
+    dues = build_dues_matrix(payments, ['회원'], schedule, terms,
+                             start_month='2024-01', end_month='2024-04')
+    return dues['members_status']['회원'], dues
+
+# (설명, 납부 내역, 일정, 가입/탈퇴, 기대 결과)
+CASES = [
+    ('매월 납부',
+     [_payment(m, 10000) for m in ('2024-01', '2024-02', '2024-03', '2024-04')], MONTHLY, None,
+     dict(expected_total=40000, arrears=0, credit=0, unpaid_months=0, first_unpaid_month=None,
+          current_streak=4, longest_streak=4)),
+    ('미납 없음 - 납부 기록 없음',
+     [], MONTHLY, None,
+     dict(expected_total=40000, arrears=40000, credit=0, unpaid_months=4, first_unpaid_month='2024-01',
+          current_streak=0, longest_streak=0)),
+    ('1월 미납 후 2월에 일괄 납부, 4월 미납 (1월은 정산됨)',
+     [_payment('2024-02', 20000), _payment('2024-03', 10000)], MONTHLY, None,
+     dict(expected_total=40000, arrears=10000, credit=0, unpaid_months=1, first_unpaid_month='2024-04',
+          current_streak=0, longest_streak=2)),
+    ('1월 선납',
+     [_payment('2024-01', 50000)], MONTHLY, None,
+     dict(expected_total=40000, arrears=0, credit=10000, unpaid_months=0, first_unpaid_month=None,
+          current_streak=4, longest_streak=4)),
+    ('일부 납부 (1월 일부만)',
+     [_payment('2024-01', 5000)], MONTHLY, None,
+     dict(expected_total=40000, arrears=35000, credit=0, unpaid_months=4, first_unpaid_month='2024-01',
+          current_streak=0, longest_streak=0)),
+    ('3월 가입 후 3월만 납부',
+     [_payment('2024-03', 10000)], MONTHLY, {'회원': {'join': '2024-03'}},
+     dict(expected_total=20000, arrears=10000, credit=0, unpaid_months=1, first_unpaid_month='2024-04',
+          current_streak=0, longest_streak=1)),
+    ('2월 탈퇴, 1월만 납부',
+     [_payment('2024-01', 10000)], MONTHLY, {'회원': {'leave': '2024-02'}},
+     dict(expected_total=20000, arrears=10000, credit=0, unpaid_months=1, first_unpaid_month='2024-02',
+          current_streak=0, longest_streak=1)),
+    ('3월부터 회비 인상',
+     [_payment(m, 10000) for m in ('2024-01', '2024-02', '2024-03', '2024-04')],
+     [{'from': '2024-01', 'amount': 10000}, {'from': '2024-03', 'amount': 20000}], None,
+     dict(expected_total=60000, arrears=20000, credit=0, unpaid_months=1, first_unpaid_month='2024-04',
+          current_streak=0, longest_streak=2)),
+    ('내부 이체와 세이프박스는 회비로 인정하지 않음',
+     [_payment('2024-01', 40000, is_internal_transfer=True), _payment('2024-01', 40000, is_safe_box=True)],
+     MONTHLY, None,
+     dict(expected_total=40000, arrears=40000, credit=0, unpaid_months=4, first_unpaid_month='2024-01',
+          current_streak=0, longest_streak=0)),
+]
+
+@pytest.mark.parametrize('payments, schedule, terms, expected',
+                         [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_member_status(payments, schedule, terms, expected):
+    status, _ = _status(payments, schedule, terms)
+    assert {key: status[key] for key in expected} == expected
+
+def test_join_leave_mask_expected_matrix():
+    _, dues = _status([], terms={'회원': {'join': '2024-02', 'leave': '2024-03'}})
+    assert dues['expected'] == [[0, 10000, 10000, 0]]
+
+def test_payments_outside_period_count_toward_first_and_last_month():
+    _, dues = _status([_payment('2023-11', 10000), _payment('2024-06', 30000)])
+    assert dues['paid'] == [[10000, 0, 0, 30000]]
+
+def test_unpaid_report_lists_remaining_debt_largest_first():
+    payments = [_payment('2024-02', 20000, member='정산'), _payment('2024-03', 10000, member='정산'),
+                _payment('2024-01', 40000, member='완납')]
+    dues = build_dues_matrix(payments, ['정산', '완납', '미납'], MONTHLY,
+                             start_month='2024-01', end_month='2024-04')
+
+    assert dues['unpaid_report'] == {
+        'month': '2024-04',
+        'members': [
+            {'name': '미납', 'arrears': 40000, 'first_unpaid_month': '2024-01'},
+            {'name': '정산', 'arrears': 10000, 'first_unpaid_month': '2024-04'},
+        ]
+    }
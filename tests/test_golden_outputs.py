@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+동봉된 엑셀 파일 처리 결과를 골든 파일과 비교
+
+결과가 의도적으로 바뀐 경우 UPDATE_GOLDEN=1 python -m pytest tests/test_golden_outputs.py 로 갱신
+"""
+
+import io
+import json
+import os
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import KAKAO_FILE, REPO_ROOT, REPORT_FILE, SHINHAN_FILE
+from excel_to_dashboard import read_kakao_bank_excel, read_report_excel, read_shinhan_bank_excel
+from helpers import normalize_output
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+def _check_golden(name, data):
+    golden_file = os.path.join(GOLDEN_DIR, name)
+    actual = normalize_output(data)
+
+    if os.environ.get('UPDATE_GOLDEN'):
+        with open(golden_file, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, ensure_ascii=False, separators=(',', ':'))
+            f.write('\n')
+
+    with open(golden_file, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    # 항목별로 비교하여 실패 시 어느 부분이 바뀌었는지 바로 보이도록 함
+    assert sorted(actual) == sorted(expected)
+    for key in expected:
+        assert actual[key] == expected[key], f'{name}: {key} 항목이 골든 파일과 다릅니다'
+
+def test_dashboard_data_matches_golden(pipeline_outputs):
+    dashboard, _ = pipeline_outputs
+    _check_golden('dashboard_data.json', dashboard)
+
+def test_enhanced_data_matches_golden(pipeline_outputs):
+    _, enhanced = pipeline_outputs
+    _check_golden('enhanced_dashboard_data.json', enhanced)
+
+def _project(actual, expected):
+    """실제 결과에서 커밋된 파일에 있는 키만 남김 (ID, 중복 기록 등 이후 추가된 필드 제외)"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        projected = {k: _project(v, expected[k]) for k, v in actual.items() if k in expected}
+        if expected.get('depositor_name') == '' and 'depositor_name' in projected:
+            # 보고서에서 찾지 못한 입금자명은 은행 원본 내역으로 보완됨
+            projected['depositor_name'] = ''
+        return projected
+    if isinstance(expected, list) and isinstance(actual, list) and len(actual) == len(expected):
+        return [_project(a, e) for a, e in zip(actual, expected)]
+    return actual
+
+def _load_committed(name):
+    """저장소 최상위에 커밋된 (재작성 이전 코드로 생성된) 출력 파일"""
+    with open(os.path.join(REPO_ROOT, name), 'r', encoding='utf-8') as f:
+        return normalize_output(json.load(f))
+
+def test_transactions_match_committed_dashboard(pipeline_outputs):
+    """저장소에 커밋된 dashboard_data.json과 거래/요약이 같은지 확인"""
+    dashboard, _ = pipeline_outputs
+    committed = _load_committed('dashboard_data.json')
+
+    assert dashboard['summary'] == committed['summary']
+    assert _project(dashboard['transactions'], committed['transactions']) == committed['transactions']
+
+@pytest.mark.parametrize('key', [
+    'accounts', 'summary', 'transactions', 'member_analysis', 'expense_by_category',
+    'monthly_trends', 'known_members'
+])
+def test_enhanced_matches_committed_enhanced(pipeline_outputs, key):
+    """저장소에 커밋된 enhanced_dashboard_data.json과 분석 결과가 같은지 확인 (내부 이체 판정 재작성 검증)"""
+    _, enhanced = pipeline_outputs
+    committed = _load_committed('enhanced_dashboard_data.json')
+
+    assert set(committed) <= set(enhanced)
+    assert _project(enhanced[key], committed[key]) == committed[key]
+
+@pytest.mark.parametrize('key', ['summary', 'accounts'])
+def test_enhanced_keeps_dashboard_sections(pipeline_outputs, key):
+    dashboard, enhanced = pipeline_outputs
+    assert enhanced[key] == dashboard[key]
+
+def test_excel_readers_match_golden():
+    """excel_to_dashboard 원본 읽기 결과 (컬럼과 행 수)"""
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlrd')
+
+    with redirect_stdout(io.StringIO()):
+        kakao = read_kakao_bank_excel(KAKAO_FILE)
+        shinhan = read_shinhan_bank_excel(SHINHAN_FILE)
+        report = read_report_excel(REPORT_FILE)
+
+    shapes = {
+        'kakao': {'columns': [str(c) for c in kakao.columns], 'rows': len(kakao)},
+        'shinhan': {'columns': [str(c) for c in shinhan.columns], 'rows': len(shinhan)},
+        'report_sheets': report.sheet_names
+    }
+    _check_golden('excel_shapes.json', shapes)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+이전 스냅샷의 월말 체크포인트를 재사용한 잔액 재계산 테스트 (동봉된 엑셀 파일 사용)
+"""
+
+import copy
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from balance_engine import compute_running_balances
+from conftest import KAKAO_FILE, REPORT_FILE, SHINHAN_FILE
+from json_writer import dump_json
+
+def test_rerun_recomputes_only_months_with_new_rows(pipeline_outputs, tmp_path):
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlrd')
+    from convert_excel_to_json import convert_workbooks
+
+    dashboard, _ = pipeline_outputs
+    last_month = dashboard['transactions'][-1]['date'][:7]
+
+    # 이전 실행은 마지막 달 거래가 들어오기 전에 이루어진 경우
+    previous = copy.deepcopy(dashboard)
+    previous['transactions'] = [t for t in previous['transactions'] if t['date'][:7] < last_month]
+    previous['balance_checkpoints'] = compute_running_balances(previous['transactions'])
+    output_file = str(tmp_path / 'dashboard_data.json')
+    dump_json(previous, output_file)
+
+    log = io.StringIO()
+    with redirect_stdout(log):
+        result = convert_workbooks(REPORT_FILE, KAKAO_FILE, SHINHAN_FILE, output_file=output_file)
+
+    new_rows = len(dashboard['transactions']) - len(previous['transactions'])
+    assert f'잔액 재계산 {new_rows}건' in log.getvalue()
+    assert result['balance_checkpoints'] == dashboard['balance_checkpoints']
+    assert [t['balance_after'] for t in result['transactions']] == \
+        [t['balance_after'] for t in dashboard['transactions']]
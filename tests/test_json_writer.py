@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 저장 (사전 압축, 임시 파일 처리) 테스트
+"""
+
+import gzip
+
+import pytest
+
+import json_writer
+from json_writer import PRECOMPRESS, dump_json
+
+def test_precompressed_files_match_output(tmp_path, monkeypatch):
+    # 여러 블록에 걸쳐 압축되도록 블록 크기를 줄임
+    monkeypatch.setattr(json_writer, 'COMPRESS_BLOCK_SIZE', 1024)
+    output_file = str(tmp_path / 'data.json')
+    data = {'transactions': [{'id': i, 'description': f'거래 {i}'} for i in range(2000)]}
+
+    written = dump_json(data, output_file, compress=PRECOMPRESS)
+
+    with open(output_file, 'rb') as f:
+        raw = f.read()
+    with gzip.open(f'{output_file}.gz', 'rb') as f:
+        assert f.read() == raw
+    if json_writer.brotli is not None:
+        with open(f'{output_file}.br', 'rb') as f:
+            assert json_writer.brotli.decompress(f.read()) == raw
+        assert written == [output_file, f'{output_file}.gz', f'{output_file}.br']
+
+def test_failed_encoding_keeps_previous_file_and_removes_temp(tmp_path):
+    output_file = tmp_path / 'data.json'
+    dump_json({'ok': True}, str(output_file))
+
+    with pytest.raises(TypeError):
+        dump_json({'ok': True, 'bad': object()}, str(output_file))
+
+    assert output_file.read_text(encoding='utf-8') == '{\n  "ok": true\n}'
+    assert [p.name for p in tmp_path.iterdir()] == ['data.json']
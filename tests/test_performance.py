@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 시간/메모리 예산 및 규모 증가에 따른 시간 증가율 테스트
+(pytest -m "not perf" 로 제외 가능)
+"""
+
+import copy
+import io
+import os
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import pytest
+
+from balance_engine import build_checkpoints, compute_running_balances, insert_transaction
+from convert_excel_to_json import calculate_summary
+from dedup_engine import assign_transaction_ids, merge_sources
+from dues_engine import build_dues_matrix
+from enhanced_data_processor import (
+    KNOWN_MEMBERS, analyze_expense_by_category, analyze_member_contributions,
+    analyze_monthly_trends, enhance_transactions
+)
+from helpers import make_ledger
+from json_writer import dump_json
+from rollup_cube import build_rollup_cube, summary_from_cube
+from snapshot_delta import build_delta
+
+pytestmark = pytest.mark.perf
+
+# 약 7년치 대형 단체 규모
+LEDGER_SIZE = 20000
+# 단계별 시간 예산 (초) - 느린 CI 장비를 고려해 넉넉하게 설정
+STAGE_BUDGETS = {
+    'calculate_summary': 3.0,
+    'enhance_transactions': 3.0,
+    'analyze_member_contributions': 2.0,
+    'analyze_expense_by_category': 2.0,
+    'analyze_monthly_trends': 2.0,
+    'build_rollup_cube': 3.0,
+    'summary_from_cube': 1.0,
+    'build_dues_matrix': 3.0,
+    'merge_sources': 5.0,
+    'build_delta': 2.0,
+    'dump_json': 5.0
+}
+# 입력이 4배일 때 허용하는 최대 시간 배율 (선형이면 약 4, 제곱이면 약 16)
+MAX_SCALING_RATIO = 10
+# 스트리밍 저장 시 최대 추가 메모리 (바이트)
+DUMP_MEMORY_BUDGET = 2 * 1024 * 1024
+
+def _quiet(func, *args, **kwargs):
+    """진행 상황 출력 없이 실행"""
+    with redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+def _enhanced_ledger(n, seed=0):
+    """요약 계산과 향상된 분류까지 적용된 합성 거래 n건"""
+    transactions = make_ledger(n, seed=seed)
+    _quiet(calculate_summary, transactions)
+    enhance_transactions(transactions, KNOWN_MEMBERS)
+    return transactions
+
+def _stages(transactions, tmp_dir):
+    """단계 이름 → 인자 없이 실행 가능한 함수 (입력 변경을 막기 위해 필요한 경우 사본 사용)"""
+    older = copy.deepcopy(transactions[:len(transactions) // 2])
+    assign_transaction_ids(older)
+    current = assign_transaction_ids(copy.deepcopy(transactions))
+    cube = build_rollup_cube(transactions)
+
+    return {
+        'calculate_summary': lambda: _quiet(calculate_summary, copy.deepcopy(transactions)),
+        'enhance_transactions': lambda: enhance_transactions(copy.deepcopy(transactions), KNOWN_MEMBERS),
+        'analyze_member_contributions': lambda: analyze_member_contributions(transactions),
+        'analyze_expense_by_category': lambda: analyze_expense_by_category(transactions),
+        'analyze_monthly_trends': lambda: analyze_monthly_trends(transactions),
+        'build_rollup_cube': lambda: build_rollup_cube(transactions),
+        'summary_from_cube': lambda: summary_from_cube(cube),
+        'build_dues_matrix': lambda: build_dues_matrix(
+            transactions, KNOWN_MEMBERS, [{'from': '2019-01', 'amount': 10000}]
+        ),
+        'merge_sources': lambda: merge_sources({
+            'first': copy.deepcopy(transactions), 'second': copy.deepcopy(transactions)
+        }),
+        'build_delta': lambda: build_delta(
+            {'snapshot_version': 1, 'transactions': older},
+            {'snapshot_version': 2, 'transactions': current}
+        ),
+        'dump_json': lambda: dump_json({'transactions': transactions}, os.path.join(tmp_dir, 'perf.json'))
+    }
+
+def _best_of(func, repeat=3):
+    """여러 번 실행한 중 가장 짧은 시간 (일시적인 부하 영향 최소화)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+@pytest.fixture(scope='module')
+def large_ledger():
+    return _enhanced_ledger(LEDGER_SIZE)
+
+@pytest.mark.parametrize('stage', sorted(STAGE_BUDGETS))
+def test_stage_within_time_budget(stage, large_ledger, tmp_path):
+    elapsed = _best_of(_stages(large_ledger, str(tmp_path))[stage], repeat=1)
+    assert elapsed < STAGE_BUDGETS[stage], f'{stage}: {elapsed:.2f}s (예산 {STAGE_BUDGETS[stage]}s)'
+
+@pytest.mark.parametrize('stage', sorted(STAGE_BUDGETS))
+def test_stage_scales_near_linearly(stage, tmp_path):
+    small = _stages(_enhanced_ledger(2500, seed=1), str(tmp_path))[stage]
+    large = _stages(_enhanced_ledger(10000, seed=1), str(tmp_path))[stage]
+
+    # 측정 오차가 큰 아주 짧은 시간은 하한을 두고 비교
+    small_time = max(_best_of(small), 1e-3)
+    large_time = _best_of(large)
+    ratio = large_time / small_time
+    assert ratio < MAX_SCALING_RATIO, f'{stage}: {small_time:.4f}s → {large_time:.4f}s (x{ratio:.1f})'
+
+def test_late_insert_cheaper_than_full_replay(large_ledger):
+    transactions = copy.deepcopy(large_ledger)
+    compute_running_balances(transactions)
+    late = dict(transactions.pop(), date=transactions[-1]['date'])
+    checkpoints = build_checkpoints(transactions)
+
+    insert_time = _best_of(lambda: insert_transaction(copy.copy(transactions), copy.deepcopy(checkpoints), late))
+    replay_time = _best_of(lambda: compute_running_balances(transactions + [late]))
+    assert insert_time < replay_time
+
+def test_dump_json_streams_large_arrays(large_ledger, tmp_path):
+    data = {'transactions': large_ledger}
+    output_file = str(tmp_path / 'stream.json')
+
+    tracemalloc.start()
+    try:
+        dump_json(data, output_file)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # 전체 문서를 한 번에 만들면 파일 크기만큼 메모리를 사용
+    assert os.path.getsize(output_file) > 2 * DUMP_MEMORY_BUDGET
+    assert peak < DUMP_MEMORY_BUDGET, f'최대 메모리 {peak / 1024 / 1024:.1f}MB'
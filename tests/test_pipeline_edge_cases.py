@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+빈 입력, 설정 누락 등 경계 조건 테스트
+"""
+
+import io
+import json
+from contextlib import redirect_stdout
+
+from enhanced_data_processor import KNOWN_MEMBERS, process_enhanced_data
+from json_writer import load_json
+
+DUES_SCHEDULE = [{'from': '2021-01', 'amount': 10000}]
+
+def _run_enhanced(tmp_path, data, dues_config=None):
+    """dashboard 데이터로 향상된 데이터 처리 실행 후 결과 반환"""
+    input_file = tmp_path / 'dashboard_data.json'
+    output_file = tmp_path / 'enhanced_dashboard_data.json'
+    dues_config_file = tmp_path / 'dues_config.json'
+    input_file.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    if dues_config is not None:
+        dues_config_file.write_text(json.dumps(dues_config), encoding='utf-8')
+
+    with redirect_stdout(io.StringIO()):
+        process_enhanced_data(str(input_file), str(output_file), dues_config_file=str(dues_config_file))
+    return load_json(str(output_file))
+
+def test_enhanced_handles_empty_ledger(tmp_path):
+    enhanced = _run_enhanced(tmp_path, {'transactions': [], 'summary': {}, 'accounts': {}},
+                             dues_config={'schedule': DUES_SCHEDULE})
+
+    assert enhanced['rollup_cube']['rows'] == []
+    assert enhanced['dues_status']['months'] == []
+    assert enhanced['dues_status']['members'] == KNOWN_MEMBERS
+    assert enhanced['dues_status']['unpaid_report']['members'] == []
+
+def test_dues_status_omitted_without_schedule(tmp_path, pipeline_outputs):
+    dashboard, enhanced = pipeline_outputs
+    # 회비 일정이 없으면 예정액을 추측하지 않음
+    assert enhanced['dues_status'] is None
+
+    configured = _run_enhanced(tmp_path, dashboard, dues_config={'schedule': DUES_SCHEDULE})
+    status = configured['dues_status']
+    assert status['schedule'] == DUES_SCHEDULE
+    assert status['months'][0] == '2021-01'
+    assert set(status['members_status']) == set(KNOWN_MEMBERS)